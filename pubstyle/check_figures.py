@@ -0,0 +1,64 @@
+import argparse
+import glob
+import imp
+import os
+import sys
+
+from vhbbtools.plotting.regression import Figure, check, render_spec
+
+
+# The pubstyle directory, holding the golden images under golden/.
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+
+def render_example(output):
+    """Render the Example1 figure as drawn by myMacro_vhbbstyle.py.
+    """
+    macro = imp.load_source('myMacro_vhbbstyle', os.path.join(BASE, 'Example1', 'myMacro_vhbbstyle.py'))
+    return macro.draw(output)
+
+
+def figures():
+    """Return Example1 and the figure of every .root file next to a spec.yaml.
+    """
+    found = [Figure('Example1/myMacro_vhbbstyle', render_example, ())]
+    for spec in sorted(glob.glob(os.path.join(BASE, '*', 'spec.yaml'))):
+        directory = os.path.dirname(spec)
+        for path in sorted(glob.glob(os.path.join(directory, '*.root'))):
+            name = os.path.splitext(os.path.relpath(path, BASE))[0]
+            found.append(Figure(name, render_spec, (path, spec)))
+    return found
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Check the pubstyle figures against their golden images.')
+    parser.add_argument('--update', action='store_true', help='replace the golden images instead')
+    parser.add_argument('--jobs', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--tolerance', type=int, default=2, help='per-pixel channel tolerance out of 255')
+    parser.add_argument('--threshold', type=float, default=1e-4, help='fraction of pixels that may differ')
+    args = parser.parse_args()
+
+    comparisons = check(
+        figures(),
+        os.path.join(BASE, 'golden'),
+        os.path.join(BASE, 'regression_output'),
+        jobs=args.jobs,
+        tolerance=args.tolerance,
+        threshold=args.threshold,
+        update=args.update,
+    )
+    failed = [comparison for comparison in comparisons if not comparison.passed]
+    for comparison in comparisons:
+        if comparison.error:
+            status = 'ERROR'
+        elif comparison.fraction is None:
+            status = 'FAIL (size differs)'
+        else:
+            status = '{} ({:.2e} of pixels differ, max {:d})'.format(
+                'ok' if comparison.passed else 'FAIL', comparison.fraction, comparison.max_difference)
+        print('{:<40} {}'.format(comparison.name, status))
+        if comparison.error:
+            print(comparison.error)
+    print('{:d} of {:d} figures passed'.format(len(comparisons) - len(failed), len(comparisons)))
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,27 @@
+from rootpy import ROOT
+from vhbbtools.plotting import CMSCanvas
+
+
+class DecorateSuite(object):
+    """Time and peak memory of decorating a canvas many times over. The peak memory must
+    not grow with the number of calls, since each call reuses the labels and the single
+    primitive holding the decorations of the pad.
+    """
+    params = [10, 10000]
+    param_names = ['calls']
+    timeout = 600
+
+    def setup(self, calls):
+        ROOT.gROOT.SetBatch(True)
+
+    def _decorate(self, calls):
+        with CMSCanvas() as canvas:
+            for _ in range(calls):
+                canvas.decorate('35.9 fb^{-1} (13 TeV)', extra_text='Preliminary')
+        canvas.Close()
+
+    def time_decorate(self, calls):
+        self._decorate(calls)
+
+    def peakmem_decorate(self, calls):
+        self._decorate(calls)
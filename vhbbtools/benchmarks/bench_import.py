@@ -0,0 +1,21 @@
+class ImportSuite(object):
+    """Time importing vhbbtools in a fresh interpreter, which must not initialise ROOT
+    until a canvas or label is first used, and the cost of that first use for reference.
+    Run with `asv continuous` to fail on a regression of the import times.
+    """
+    def timeraw_import_plotting(self):
+        return 'import vhbbtools.plotting'
+
+    def timeraw_import_batch(self):
+        return 'from vhbbtools.plotting import batch'
+
+    def timeraw_import_transforms(self):
+        return 'from vhbbtools.plotting.transforms import SpecTransform'
+
+    def timeraw_first_canvas(self):
+        return """
+from rootpy import ROOT
+ROOT.gROOT.SetBatch(True)
+from vhbbtools.plotting import CMSCanvas
+CMSCanvas().Close()
+"""
@@ -0,0 +1,145 @@
+import copy
+import os
+import shutil
+import tempfile
+
+from rootpy import ROOT
+from rootpy.io import root_open
+from vhbbtools.io import iter_objects
+from vhbbtools.plotting import CMSCanvas, batch
+from vhbbtools.plotting.transforms import SpecTransform
+
+from .synthetic import CHANNELS, ratio_plot_spec, write_ratio_plot
+
+
+# The numbers of files in the batches.
+FILES = [1, 100, 1000]
+
+
+def _write_inputs(directory, channels=CHANNELS):
+    """Write the largest batch of inputs of the given channels as copies of one synthetic
+    ratio plot per channel, and return their paths keyed by the channel.
+    """
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    paths = {}
+    for channel in channels:
+        first = os.path.join(directory, '{}_0.root'.format(channel))
+        write_ratio_plot(first, **CHANNELS[channel])
+        paths[channel] = [first]
+        for i in range(1, max(FILES)):
+            path = os.path.join(directory, '{}_{:d}.root'.format(channel, i))
+            shutil.copyfile(first, path)
+            paths[channel].append(path)
+    return paths
+
+
+class StageSuite(object):
+    """Time of the stages of restyling a batch of ratio plots shaped like those of each
+    channel. Each benchmark runs the pipeline up to and including its stage, so the cost
+    of a stage is the difference with the benchmark of the stage before it:
+    open, read, transform, decorate.
+    """
+    params = [sorted(CHANNELS), FILES]
+    param_names = ['channel', 'files']
+    number = 1
+    repeat = 3
+    timeout = 1200
+
+    def setup_cache(self):
+        return _write_inputs(os.path.abspath('inputs'))
+
+    def setup(self, paths, channel, files):
+        ROOT.gROOT.SetBatch(True)
+        self.paths = paths[channel][:files]
+        spec = ratio_plot_spec(**CHANNELS[channel])
+        self.transform = SpecTransform(spec)
+        undecorated_spec = copy.deepcopy(spec)
+        for pad in undecorated_spec['pads']:
+            pad['decorate'] = False
+        self.undecorated_transform = SpecTransform(undecorated_spec)
+
+    def _restyle(self, transform):
+        for path in self.paths:
+            for _, old_canvas in iter_objects(path):
+                with CMSCanvas(**transform.canvas_options) as new_canvas:
+                    transform(old_canvas, new_canvas)
+                new_canvas.Close()
+                break
+
+    def time_open(self, paths, channel, files):
+        for path in self.paths:
+            with root_open(path):
+                pass
+
+    def time_read(self, paths, channel, files):
+        for path in self.paths:
+            for _ in iter_objects(path):
+                break
+
+    def time_transform(self, paths, channel, files):
+        self._restyle(self.undecorated_transform)
+
+    def time_decorate(self, paths, channel, files):
+        self._restyle(self.transform)
+
+
+class ExportSuite(object):
+    """Time of saving a restyled ZllH ratio plot in each format as many times as there
+    are files in a batch.
+    """
+    params = [['pdf', 'png', 'svg', 'C', 'root'], FILES]
+    param_names = ['format', 'files']
+    number = 1
+    repeat = 3
+    timeout = 1200
+
+    def setup_cache(self):
+        path = os.path.abspath('ZllH.root')
+        write_ratio_plot(path, **CHANNELS['ZllH'])
+        return path
+
+    def setup(self, path, extension, files):
+        ROOT.gROOT.SetBatch(True)
+        self.directory = tempfile.mkdtemp()
+        transform = SpecTransform(ratio_plot_spec(**CHANNELS['ZllH']))
+        self.input_file = root_open(path)
+        old_canvas = self.input_file.GetListOfKeys()[0].ReadObj()
+        self.canvas = CMSCanvas(**transform.canvas_options)
+        self.canvas.__enter__()
+        transform(old_canvas, self.canvas)
+
+    def teardown(self, path, extension, files):
+        self.canvas.__exit__(None, None, None)
+        self.canvas.Close()
+        self.input_file.Close()
+        shutil.rmtree(self.directory)
+
+    def time_export(self, path, extension, files):
+        for i in range(files):
+            self.canvas.export(os.path.join(self.directory, 'figure{:d}'.format(i)), (extension,))
+
+
+class BatchSuite(object):
+    """Time of restyling a batch of ZllH ratio plots end to end through batch.run,
+    either serially or over a pool of worker processes.
+    """
+    params = [FILES, [1, 4]]
+    param_names = ['files', 'jobs']
+    number = 1
+    repeat = 3
+    timeout = 1200
+
+    def setup_cache(self):
+        return _write_inputs(os.path.abspath('inputs'), ['ZllH'])['ZllH']
+
+    def setup(self, paths, files, jobs):
+        self.paths = paths[:files]
+        self.directory = tempfile.mkdtemp()
+        self.transform = SpecTransform(ratio_plot_spec(**CHANNELS['ZllH']))
+
+    def teardown(self, paths, files, jobs):
+        shutil.rmtree(self.directory)
+
+    def time_run(self, paths, files, jobs):
+        batch.run(self.paths, self.transform, jobs=jobs, output_dir=self.directory)
@@ -0,0 +1,30 @@
+from rootpy import ROOT
+from vhbbtools import stats
+
+
+class Chi2Suite(object):
+    """Time to compute the chi2/NDF of many data and MC histogram pairs, batched through
+    vhbbtools.stats versus one TH1::Chi2Test call per pair.
+    """
+    params = [1, 100, 1000]
+    param_names = ['histograms']
+
+    def setup(self, histograms):
+        ROOT.gRandom.SetSeed(1)
+        self.data, self.mc = [], []
+        for i in range(histograms):
+            data = ROOT.TH1D('data{:d}'.format(i), '', 50, -3, 3)
+            mc = ROOT.TH1D('mc{:d}'.format(i), '', 50, -3, 3)
+            data.FillRandom('gaus', 1000)
+            mc.Sumw2()
+            mc.FillRandom('gaus', 5000)
+            mc.Scale(0.2)
+            self.data.append(data)
+            self.mc.append(mc)
+
+    def time_chi2_ndf(self, histograms):
+        stats.chi2_ndf(self.data, self.mc)
+
+    def time_chi2test(self, histograms):
+        for data, mc in zip(self.data, self.mc):
+            data.Chi2Test(mc, 'UWCHI2/NDF')
@@ -0,0 +1,29 @@
+from rootpy import ROOT
+from vhbbtools.plotting import CMSCanvas
+from vhbbtools.plotting.styles import TDRStyle, use_style
+
+
+class StyleSuite(object):
+    """Time the cost of entering a canvas in the TDR style, compared with constructing
+    the style from scratch as every CMSCanvas used to do.
+    """
+    def setup(self):
+        ROOT.gROOT.SetBatch(True)
+        # Construct the cached style outside of the timings.
+        with use_style('tdrStyle'):
+            pass
+        self.canvas = CMSCanvas()
+
+    def teardown(self):
+        self.canvas.Close()
+
+    def time_construct_tdr_style(self):
+        TDRStyle()
+
+    def time_use_style(self):
+        with use_style('tdrStyle'):
+            pass
+
+    def time_canvas_enter(self):
+        with self.canvas:
+            pass
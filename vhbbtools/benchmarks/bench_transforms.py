@@ -0,0 +1,39 @@
+import os
+
+from rootpy.io import root_open
+from vhbbtools.plotting import CMSCanvas
+from vhbbtools.plotting.transforms import SpecTransform
+
+from .synthetic import RATIO_PLOT_SPEC, write_ratio_plot
+
+
+class TransformSuite(object):
+    """Time and peak memory per file of reading and transforming a ratio plot with
+    large-binned histograms, either cloning the primitives redrawn on top as the
+    restyle.py scripts used to do or moving them in place.
+    """
+    params = [False, True]
+    param_names = ['inplace']
+    number = 1
+    repeat = 10
+    timeout = 600
+
+    def setup_cache(self):
+        path = os.path.abspath('ratio_plot_1M_bins.root')
+        write_ratio_plot(path, nbins=1000000)
+        return path
+
+    def setup(self, path, inplace):
+        self.transform = SpecTransform(RATIO_PLOT_SPEC, inplace=inplace)
+
+    def _transform_file(self, path):
+        with root_open(path) as f:
+            old_canvas = f.GetListOfKeys()[0].ReadObj()
+            with CMSCanvas(**self.transform.canvas_options) as new_canvas:
+                self.transform(old_canvas, new_canvas)
+
+    def time_file(self, path, inplace):
+        self._transform_file(path)
+
+    def peakmem_file(self, path, inplace):
+        self._transform_file(path)
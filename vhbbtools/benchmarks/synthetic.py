@@ -0,0 +1,162 @@
+import copy
+
+from rootpy import ROOT
+from rootpy.io import root_open
+
+
+# A spec restyling the synthetic ratio plots like pubstyle/ZllH/spec.yaml.
+RATIO_PLOT_SPEC = {
+    'canvas': {'height': 800},
+    'style': {'gStyle.SetErrorX': 0},
+    'decorations': {'lumi_text': '35.9 fb^{-1} (13 TeV)', 'extra_text': 'Preliminary'},
+    'pads': [
+        {
+            'name': 'oben',
+            'decorate': True,
+            'set': {'SetPad': [0.0, 0.301, 1.0, 1.0], 'SetBottomMargin': 0.018, 'SetTopMargin': 0.08},
+            'primitives': [
+                {
+                    'select': {'class': 'THStack'},
+                    'set': {
+                        'GetHists[*].SetLineWidth': 1,
+                        'GetXaxis.SetLabelSize': 0.,
+                        'GetXaxis.SetTitleSize': 0.,
+                        'GetYaxis.SetTitleOffset': 1.2,
+                    },
+                },
+                {
+                    'select': {'class': 'TH1', 'index': -1},
+                    'option': 'E1SAME',
+                    'set': {'SetMarkerSize': 0.9},
+                },
+                {
+                    'select': {'class': 'TLegend', 'index': 0},
+                    'raise': True,
+                    'set': {'SetX1NDC': 0.5, 'SetY1NDC': 0.68, 'SetX2NDC': 0.75, 'SetY2NDC': 0.88},
+                },
+                {
+                    'select': {'class': 'TLegend', 'index': 1},
+                    'raise': True,
+                    'set': {'SetX1NDC': 0.69, 'SetY1NDC': 0.68, 'SetX2NDC': 0.94, 'SetY2NDC': 0.88},
+                },
+                {'select': {'class': 'TLatex', 'index': ':'}, 'remove': True},
+                {
+                    'select': {'class': 'TLatex', 'index': 2},
+                    'raise': True,
+                    'set': {'SetTitle': '2-lepton (#mu), High p_{T}(V)', 'SetY': 0.73},
+                },
+                {
+                    'select': {'class': 'TLatex', 'index': 4},
+                    'raise': True,
+                    'set': {'SetTitle': 'Z+b#bar{b} Enriched', 'SetY': 0.68},
+                },
+            ],
+        },
+        {
+            'name': 'unten',
+            'set': {'SetPad': [0.0, 0.0, 1.0, 0.299], 'SetTopMargin': 0},
+            'primitives': [
+                {
+                    'select': 1,
+                    'set': {'SetMaximum': 1.999, 'SetMinimum': 0, 'GetYaxis.SetTitle': 'Data / MC'},
+                },
+                {'select': 3, 'option': 'E1SAME', 'set': {'SetMarkerSize': 0.9}},
+            ],
+        },
+    ],
+}
+
+
+# The shapes of the postfit ratio plots of each channel restyled in pubstyle, given as
+# keyword arguments of write_ratio_plot.
+CHANNELS = {
+    'ZllH': {'nbins': 40, 'ncomponents': 8, 'ntexts': 5},
+    'ZnnH': {'nbins': 40, 'ncomponents': 10, 'ntexts': 4},
+    'WlnH': {'nbins': 20, 'ncomponents': 12, 'ntexts': 5, 'pad_names': ('can_0', 'can_1'), 'pave_text': True},
+}
+
+
+def ratio_plot_spec(pad_names=('oben', 'unten'), pave_text=False, **kwargs):
+    """Return RATIO_PLOT_SPEC adapted to a canvas written by write_ratio_plot with the
+    given shape. The other keyword arguments are ignored, so a channel in CHANNELS can
+    be passed as is.
+    """
+    spec = copy.deepcopy(RATIO_PLOT_SPEC)
+    upper_pad, lower_pad = spec['pads']
+    upper_pad['name'], lower_pad['name'] = pad_names
+    if pave_text:
+        upper_pad['primitives'].append({
+            'select': {'class': 'TPaveText', 'index': -1},
+            'raise': True,
+            'set': {'SetTextSize': 0.04},
+        })
+    return spec
+
+
+def write_ratio_plot(path, nbins=100, ncomponents=8, ntexts=5, pad_names=('oben', 'unten'), pave_text=False):
+    """Write a canvas shaped like the postfit ratio plots restyled in pubstyle/ZllH to a
+    .root file. The upper pad named 'oben' holds a THStack, the MC uncertainty, the data,
+    two legends, and the texts, and the lower pad named 'unten' holds the ratio, its
+    uncertainty band, a copy of the ratio, and a legend. The pads may be named otherwise
+    as in WlnH, whose upper pad also holds a TPaveText.
+    """
+    ROOT.gROOT.SetBatch(True)
+    canvas = ROOT.TCanvas('c', 'c', 600, 700)
+    upper_pad = ROOT.TPad(pad_names[0], pad_names[0], 0.0, 0.3, 1.0, 1.0)
+    lower_pad = ROOT.TPad(pad_names[1], pad_names[1], 0.0, 0.0, 1.0, 0.3)
+    upper_pad.Draw()
+    lower_pad.Draw()
+    # Upper Pad
+    upper_pad.cd()
+    shape = ROOT.TF1('shape', 'exp(-3*x)', 0, 1)
+    stack = ROOT.THStack('stack', ';x;Entries')
+    total = ROOT.TH1D('total', 'total', nbins, 0, 1)
+    components = []
+    for i in range(ncomponents):
+        hist = ROOT.TH1D('mc{:d}'.format(i), 'mc{:d}'.format(i), nbins, 0, 1)
+        hist.FillRandom('shape', 1000 * (i + 1))
+        hist.SetFillColor(i + 2)
+        stack.Add(hist)
+        total.Add(hist)
+        components.append(hist)
+    data = ROOT.TH1D('data_obs', 'data_obs', nbins, 0, 1)
+    data.FillRandom('shape', int(total.Integral()))
+    stack.Draw('hist')
+    total.SetFillStyle(3013)
+    total.Draw('E2 same')
+    data.Draw('PE same')
+    legends = [ROOT.TLegend(0.5, 0.6, 0.7, 0.88), ROOT.TLegend(0.7, 0.6, 0.9, 0.88)]
+    legends[0].AddEntry(data, 'Data', 'pe')
+    for i, hist in enumerate(components):
+        legends[i % 2].AddEntry(hist, hist.GetTitle(), 'f')
+    legends[1].AddEntry(total, 'MC Unc.', 'f')
+    for legend in legends:
+        legend.Draw()
+    # Keep references to everything drawn, since PyROOT deletes the objects it owns
+    # and thereby removes them from the pad once they are garbage collected.
+    texts = [ROOT.TLatex(0.2, 0.85 - 0.05 * i, 'text {:d}'.format(i)) for i in range(ntexts)]
+    for text in texts:
+        text.SetNDC()
+        text.Draw()
+    pave = ROOT.TPaveText(0.2, 0.5, 0.45, 0.6, 'NDC')
+    if pave_text:
+        pave.AddText('W#rightarrowl#nu')
+        pave.Draw()
+    # Lower Pad
+    lower_pad.cd()
+    ratio = data.Clone('ratio')
+    ratio.Divide(total)
+    ratio.Draw('PE')
+    band = total.Clone('band')
+    band.Divide(total)
+    band.Draw('E2 same')
+    ratio2 = ratio.Clone('ratio2')
+    ratio2.Draw('PE same')
+    legend = ROOT.TLegend(0.3, 0.85, 0.9, 0.95)
+    legend.AddEntry(band, 'MC Unc.', 'f')
+    legend.Draw()
+    # Paint the canvas so that the pads hold their frames, as in the real inputs.
+    canvas.Update()
+    with root_open(path, 'recreate'):
+        canvas.Write()
+    canvas.Close()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 import os
+import re
 import sys
 
 from setuptools import find_packages, setup
@@ -38,10 +39,15 @@ def readme():
     with open(os.path.join(PACKAGE_PATH, 'README.rst')) as f:
         return f.read()
 
+# Return the version string defined in vhbbtools/__init__.py.
+def version():
+    with open(os.path.join(PACKAGE_PATH, 'vhbbtools', '__init__.py')) as f:
+        return re.search(r"^__version__ = '(.+)'$", f.read(), re.M).group(1)
+
 # vhbbutils Package Setup
 setup(
     name = 'vhbbtools',
-    version = '0.0.0.dev0',
+    version = version(),
     description = 'Tools for CMS VHbb physics analyses.',
     long_description = readme(),
     author = 'Sean-Jiun Wang',
@@ -58,14 +64,19 @@ setup(
         'Programming Language :: Python :: 2 :: Only',
         'Topic :: Scientific/Engineering :: Physics',
     ],
-    packages = find_packages(),
+    packages = find_packages(exclude=['benchmarks', 'benchmarks.*']),
     install_requires = [
         'contextlib2',
         'dill',
         'jinja2',
+        'numpy',
         'pandas',
+        'pyyaml',
         'rootpy',
     ],
+    extras_require = {
+        'uproot': ['uproot'],
+    },
     setup_requires = [
         'pytest-runner',
     ],
@@ -74,6 +85,9 @@ setup(
     ],
     scripts = [],
     entry_points = {
-        'console_scripts': [],
+        'console_scripts': [
+            'vhbb-restyle = vhbbtools.plotting.cli:main',
+            'vhbb-restyle-daemon = vhbbtools.plotting.daemon:main',
+        ],
     },
 )
@@ -0,0 +1,127 @@
+"""Stand-ins for the few ROOT classes used by the spec transforms, so that the logic
+moving primitives around a pad can be tested without ROOT.
+"""
+
+
+class FakeClass(object):
+
+    def __init__(self, name, bases=()):
+        self.name = name
+        self.bases = bases
+
+    def GetName(self):
+        return self.name
+
+    def GetListOfBases(self):
+        return [FakeBase(base) for base in self.bases]
+
+
+class FakeBase(object):
+
+    def __init__(self, tclass):
+        self.tclass = tclass
+
+    def GetClassPointer(self):
+        return self.tclass
+
+
+TOBJECT = FakeClass('TObject')
+TH1 = FakeClass('TH1', (TOBJECT,))
+TH1F = FakeClass('TH1F', (TH1,))
+TLATEX = FakeClass('TLatex', (TOBJECT,))
+TLEGEND = FakeClass('TLegend', (TOBJECT,))
+
+
+class FakeObject(object):
+
+    def __init__(self, tclass, name=''):
+        self.tclass = tclass
+        self.name = name
+        self.title = name
+        self.reset = False
+
+    def IsA(self):
+        return self.tclass
+
+    def GetName(self):
+        return self.name
+
+    def InheritsFrom(self, name):
+        tclasses = [self.tclass]
+        while tclasses:
+            tclass = tclasses.pop()
+            if tclass.name == name:
+                return True
+            tclasses.extend(tclass.bases)
+        return False
+
+    def Clone(self):
+        clone = FakeObject(self.tclass, self.name)
+        clone.title = self.title
+        return clone
+
+    def Reset(self):
+        self.reset = True
+
+    def SetTitle(self, title):
+        self.title = title
+
+    def __repr__(self):
+        return '<{} {}>'.format(self.tclass.name, self.name)
+
+
+class FakeLink(object):
+
+    def __init__(self, primitives, obj, option):
+        self.primitives = primitives
+        self.obj = obj
+        self.option = option
+
+    def GetObject(self):
+        return self.obj
+
+    def GetOption(self):
+        return self.option
+
+    def SetOption(self, option):
+        self.option = option
+
+    def Next(self):
+        links = self.primitives.links
+        position = links.index(self) + 1
+        return links[position] if position < len(links) else None
+
+
+class FakeList(object):
+    """A TList, which may hold an object more than once and removes either a given link
+    or the first link of a given object.
+    """
+    def __init__(self):
+        self.links = []
+
+    def FirstLink(self):
+        return self.links[0] if self.links else None
+
+    def Add(self, obj, option=''):
+        self.links.append(FakeLink(self, obj, option))
+
+    def Remove(self, item):
+        for position, link in enumerate(self.links):
+            if link is item or link.obj is item:
+                del self.links[position]
+                return link.obj
+        return None
+
+    def contents(self):
+        return [(link.obj, link.option) for link in self.links]
+
+
+class FakePad(object):
+
+    def __init__(self, entries):
+        self.primitives = FakeList()
+        for obj, option in entries:
+            self.primitives.Add(obj, option)
+
+    def GetListOfPrimitives(self):
+        return self.primitives
@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+uproot = pytest.importorskip('uproot')
+
+from vhbbtools.io.arrays import read_canvas
+
+
+class _Axis(object):
+
+    def __init__(self, edges):
+        self._edges = edges
+
+    def edges(self):
+        return np.asarray(self._edges)
+
+
+class _Model(object):
+    """Stand-in for an object read by uproot 4 or later, holding the given data members.
+    """
+
+    def __init__(self, classname, **members):
+        self.classname = classname
+        self._members = members
+
+    def member(self, name):
+        return self._members[name]
+
+    def has_member(self, name):
+        return name in self._members
+
+
+class _Histogram(_Model):
+
+    def __init__(self, name, edges, contents, variances, classname='TH1F'):
+        super(_Histogram, self).__init__(classname, fName=name)
+        self._axis = _Axis(edges)
+        self._contents = np.asarray(contents)
+        self._variances = np.asarray(variances)
+
+    def axis(self):
+        return self._axis
+
+    def values(self, flow=False):
+        assert not flow
+        return self._contents
+
+    def variances(self, flow=False):
+        assert not flow
+        return self._variances
+
+
+class _Directory(object):
+
+    def __init__(self, objects):
+        self._objects = objects
+        self.closed = False
+
+    def classnames(self):
+        return {name + ';1': obj.classname for name, obj in self._objects.items()}
+
+    def __getitem__(self, name):
+        return self._objects[name]
+
+    def close(self):
+        self.closed = True
+
+
+def _ratio_canvas():
+    data = _Histogram('data', [0., 1., 2.], [3., 4.], [3., 4.])
+    stack = _Model(
+        'THStack',
+        fName='mc',
+        fHists=[
+            _Histogram('ZH', [0., 1., 2.], [1., 2.], [0.5, 1.]),
+            _Histogram('TT', [0., 1., 2.], [2., 1.], [1., 0.25]),
+        ],
+    )
+    frame = _Model('TFrame', fName='frame')
+    upper = _Model('TPad', fName='oben', fPrimitives=[frame, stack, data])
+    graph = _Model(
+        'TGraphAsymmErrors',
+        fName='ratio',
+        fNpoints=2,
+        fX=[0.5, 1.5, 0.],
+        fY=[1., 1.3333, 0.],
+        fEXlow=[0.5, 0.5, 0.],
+        fEXhigh=[0.5, 0.5, 0.],
+        fEYlow=[0.2, 0.3, 0.],
+        fEYhigh=[0.25, 0.35, 0.],
+    )
+    line = _Model('TGraph', fName='line', fNpoints=2, fX=[0., 2.], fY=[1., 1.])
+    lower = _Model('TPad', fName='unten', fPrimitives=[_Model('TLegend', fName='legend'), graph, line])
+    empty = _Model('TPad', fName='empty', fPrimitives=[])
+    return _Model('TCanvas', fName='canvas', fPrimitives=[upper, lower, empty])
+
+
+def test_read_canvas_pads_in_drawing_order():
+    directory = _Directory({'data': _Histogram('data', [0., 1.], [1.], [1.]), 'canvas': _ratio_canvas()})
+    pads = read_canvas(directory)
+    assert list(pads) == ['oben', 'unten']
+    assert not directory.closed
+
+    upper = pads['oben']
+    hist, = upper.histograms
+    assert (hist.name, hist.class_name) == ('data', 'TH1F')
+    np.testing.assert_array_equal(hist.edges, [0., 1., 2.])
+    np.testing.assert_array_equal(hist.contents, [3., 4.])
+    stack, = upper.stacks
+    assert (stack.name, stack.names) == ('mc', ['ZH', 'TT'])
+    np.testing.assert_array_equal(stack.contents, [[1., 2.], [2., 1.]])
+    np.testing.assert_array_equal(stack.variances, [[0.5, 1.], [1., 0.25]])
+    assert upper.graphs == []
+
+    ratio, line = pads['unten'].graphs
+    assert ratio.class_name == 'TGraphAsymmErrors'
+    np.testing.assert_array_equal(ratio.x, [0.5, 1.5])
+    np.testing.assert_array_equal(ratio.y_low, [0.2, 0.3])
+    np.testing.assert_array_equal(ratio.y_high, [0.25, 0.35])
+    np.testing.assert_array_equal(line.y, [1., 1.])
+    np.testing.assert_array_equal(line.x_low, [0., 0.])
+
+
+def test_read_canvas_by_name():
+    directory = _Directory({'canvas': _ratio_canvas(), 'other': _Model('TCanvas', fName='other', fPrimitives=[])})
+    assert read_canvas(directory, 'other') == {}
+
+
+def test_read_file_without_canvas(tmpdir):
+    path = str(tmpdir.join('histogram.root'))
+    output = uproot.recreate(path)
+    output['data'] = np.histogram([0.5, 1.5, 1.5], bins=[0., 1., 2.])
+    output.close()
+    with pytest.raises(KeyError):
+        read_canvas(path)
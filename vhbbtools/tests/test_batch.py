@@ -0,0 +1,28 @@
+import os
+
+from vhbbtools.plotting.batch import read_manifest
+
+
+def test_read_manifest(tmpdir):
+    inputs = tmpdir.mkdir('inputs')
+    for name in ('b.root', 'a.root', 'c.txt'):
+        inputs.join(name).write('')
+    absolute = str(tmpdir.join('elsewhere.root'))
+    manifest = tmpdir.join('manifest.txt')
+    manifest.write('\n'.join([
+        '# Figures for the review',
+        'first.root',
+        '',
+        '#skipped.root',
+        'inputs/*.root  # every input',
+        '   spaced.root   ',
+        absolute,
+    ]) + '\n')
+    base = str(tmpdir)
+    assert read_manifest(str(manifest)) == [
+        os.path.join(base, 'first.root'),
+        os.path.join(base, 'inputs', 'a.root'),
+        os.path.join(base, 'inputs', 'b.root'),
+        os.path.join(base, 'spaced.root'),
+        absolute,
+    ]
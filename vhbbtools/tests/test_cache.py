@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+from vhbbtools.plotting import cache
+from vhbbtools.plotting.cache import OutputCache
+
+
+class _Transform(object):
+
+    def fingerprint(self):
+        return 'transform'
+
+
+@pytest.fixture(autouse=True)
+def style_digest(monkeypatch):
+    # The digest of the TDR style needs ROOT, and the style is the same for every key.
+    monkeypatch.setattr(cache, '_style_digest', lambda name: 'style')
+
+
+def _write(path, contents):
+    with open(str(path), 'w') as f:
+        f.write(contents)
+    return str(path)
+
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def _render(tmpdir, name, contents):
+    """Write the outputs of a figure and return the prefix shared by them and their paths.
+    """
+    prefix = str(tmpdir.join(name))
+    return prefix, [_write(prefix + '_restyled.' + extension, contents + extension) for extension in ('pdf', 'png')]
+
+
+def test_hit_after_store(tmpdir):
+    output_cache = OutputCache(str(tmpdir.join('cache')))
+    path = _write(tmpdir.join('input.root'), 'input')
+    key = output_cache.key(path, _Transform(), {'formats': ['pdf', 'png']})
+    prefix, outputs = _render(tmpdir, 'input', 'figure')
+    assert output_cache.fetch(key, prefix) is None
+    output_cache.store(key, outputs, prefix)
+    for output in outputs:
+        os.remove(output)
+    assert output_cache.fetch(key, prefix) == outputs
+    assert [_read(output) for output in outputs] == ['figurepdf', 'figurepng']
+
+
+def test_miss_after_input_or_options_change(tmpdir):
+    output_cache = OutputCache(str(tmpdir.join('cache')))
+    path = _write(tmpdir.join('input.root'), 'input')
+    options = {'formats': ['pdf', 'png']}
+    key = output_cache.key(path, _Transform(), options)
+    prefix, outputs = _render(tmpdir, 'input', 'figure')
+    output_cache.store(key, outputs, prefix)
+    changed_options = output_cache.key(path, _Transform(), {'formats': ['pdf']})
+    _write(path, 'changed input')
+    changed_input = output_cache.key(path, _Transform(), options)
+    assert len({key, changed_options, changed_input}) == 3
+    assert output_cache.fetch(changed_options, prefix) is None
+    assert output_cache.fetch(changed_input, prefix) is None
+
+
+def test_fetch_copies_to_new_prefix(tmpdir):
+    output_cache = OutputCache(str(tmpdir.join('cache')))
+    first = _write(tmpdir.join('first.root'), 'input')
+    second = _write(tmpdir.join('second.root'), 'input')
+    key = output_cache.key(first, _Transform(), {})
+    # Byte-identical inputs share an entry.
+    assert output_cache.key(second, _Transform(), {}) == key
+    prefix, outputs = _render(tmpdir, 'first', 'figure')
+    output_cache.store(key, outputs, prefix)
+    fetched = output_cache.fetch(key, str(tmpdir.join('second')))
+    assert fetched == [str(tmpdir.join('second_restyled.pdf')), str(tmpdir.join('second_restyled.png'))]
+    assert [_read(output) for output in fetched] == ['figurepdf', 'figurepng']
+
+
+def test_store_rejects_outputs_outside_prefix(tmpdir):
+    output_cache = OutputCache(str(tmpdir.join('cache')))
+    prefix, outputs = _render(tmpdir, 'input', 'figure')
+    with pytest.raises(ValueError):
+        output_cache.store('key', outputs, str(tmpdir.join('other')))
+
+
+def test_evicts_least_recently_used(tmpdir):
+    # Each entry holds two outputs of 9 bytes and a manifest of 34 bytes, so three
+    # entries exceed the size.
+    output_cache = OutputCache(str(tmpdir.join('cache')), max_size=150)
+    for age, key in enumerate(['recent', 'old']):
+        prefix, outputs = _render(tmpdir, key, 'figure')
+        output_cache.store(key, outputs, prefix)
+        entry = os.path.join(output_cache.directory, key)
+        os.utime(entry, (1e9 - age * 1e3, 1e9 - age * 1e3))
+    assert sorted(os.listdir(output_cache.directory)) == ['old', 'recent']
+    prefix, outputs = _render(tmpdir, 'new', 'figure')
+    output_cache.store('new', outputs, prefix)
+    assert sorted(os.listdir(output_cache.directory)) == ['new', 'recent']
@@ -0,0 +1,43 @@
+import pytest
+
+from vhbbtools.plotting.cli import main
+
+
+@pytest.fixture
+def spec(tmpdir):
+    path = tmpdir.join('spec.yaml')
+    path.write('pads: []\n')
+    return str(path)
+
+
+@pytest.mark.parametrize('options, message', [
+    (['--daemon', '--cache', 'cache'], '--cache cannot be used with --daemon'),
+    (['--daemon', '--packet', 'packet.pdf'], '--packet cannot be used with --daemon'),
+    (['--daemon', '--prefetch', '2'], '--prefetch cannot be used with --daemon'),
+    (['--daemon', '--jobs', '2'], '--jobs cannot be used with --daemon'),
+    (['--daemon', '--background'], '--background cannot be used with --daemon'),
+    (['--prefetch', '2'], '--prefetch requires --jobs 1'),
+    (['--jobs', '4', '--prefetch', '2', '--background'], '--prefetch, --background requires --jobs 1'),
+    (['--packet', 'packet.pdf', '--jobs', '4'], '--jobs cannot be used with --packet'),
+])
+def test_rejects_ignored_options(spec, options, message, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(['input.root', '--spec', spec] + options)
+    assert exit_info.value.code == 2
+    assert message in capsys.readouterr()[1]
+
+
+def test_rejects_malformed_spec(tmpdir, capsys):
+    path = tmpdir.join('spec.yaml')
+    path.write('pads: [a: 1\n')
+    with pytest.raises(SystemExit) as exit_info:
+        main(['input.root', '--spec', str(path)])
+    assert exit_info.value.code == 2
+    assert 'Malformed YAML' in capsys.readouterr().err
+
+
+def test_dry_run_warns_about_ignored_options(spec, capsys):
+    assert main(['input.root', '--spec', spec, '--dry-run', '--jobs', '1', '--prefetch', '2']) == 0
+    out, err = capsys.readouterr()
+    assert '--jobs, --prefetch ignored with --dry-run' in err
+    assert out == 'input.root (missing) -> input_restyled.pdf\n'
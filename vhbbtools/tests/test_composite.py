@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip('rootpy')
+
+from vhbbtools.plotting.composite import grid_layout
+
+
+def _frame(panel):
+    """Return the NDC bounds of the frame of a panel on the canvas.
+    """
+    x1, y1, x2, y2 = panel.bounds
+    left, right, bottom, top = panel.margins
+    return (x1 + left * (x2 - x1), y1 + bottom * (y2 - y1), x2 - right * (x2 - x1), y2 - top * (y2 - y1))
+
+
+def test_single_pad_covers_canvas():
+    margins = (0.16, 0.02, 0.13, 0.08)
+    panel, = grid_layout((1,), (1,), margins, 0.02)
+    assert (panel.row, panel.column) == (0, 0)
+    assert panel.bounds == pytest.approx((0., 0., 1., 1.))
+    assert panel.margins == pytest.approx(margins)
+    assert panel.text_scale == pytest.approx(1.)
+    assert panel.tick_scales == pytest.approx((1., 1.))
+
+
+def test_two_by_two_grid():
+    panels = grid_layout((1, 1), (1, 1), (0.1, 0.1, 0.1, 0.1), 0.1)
+    assert [(panel.row, panel.column) for panel in panels] == [(0, 0), (0, 1), (1, 0), (1, 1)]
+    assert [panel.bounds for panel in panels] == [
+        pytest.approx((0., 0.5, 0.5, 1.)),
+        pytest.approx((0.5, 0.5, 1., 1.)),
+        pytest.approx((0., 0., 0.5, 0.5)),
+        pytest.approx((0.5, 0., 1., 0.5)),
+    ]
+    assert panels[0].margins == pytest.approx((0.2, 0.1, 0.1, 0.2))
+    assert panels[3].margins == pytest.approx((0.1, 0.2, 0.2, 0.1))
+    assert [_frame(panel) for panel in panels] == [
+        pytest.approx((0.1, 0.55, 0.45, 0.9)),
+        pytest.approx((0.55, 0.55, 0.9, 0.9)),
+        pytest.approx((0.1, 0.1, 0.45, 0.45)),
+        pytest.approx((0.55, 0.1, 0.9, 0.45)),
+    ]
+    for panel in panels:
+        assert panel.text_scale == pytest.approx(2.)
+        assert panel.tick_scales == pytest.approx((2., 2.))
+
+
+def test_uneven_ratio_grid():
+    margins = (0.16, 0.02, 0.13, 0.08)
+    upper, lower = grid_layout((0.7, 0.3), (1,), margins, 0.)
+    split = 0.13 + 0.3 * 0.79
+    assert upper.bounds == pytest.approx((0., split, 1., 1.))
+    assert lower.bounds == pytest.approx((0., 0., 1., split))
+    assert upper.margins == pytest.approx((0.16, 0.02, 0., 0.08 / (1 - split)))
+    assert lower.margins == pytest.approx((0.16, 0.02, 0.13 / split, 0.))
+    assert upper.text_scale == pytest.approx(1 / (1 - split))
+    assert lower.tick_scales == pytest.approx((1 / split, 1.))
+
+
+def test_uneven_columns_share_the_frame_width():
+    margins = (0.1, 0.05, 0.1, 0.05)
+    panels = grid_layout((1,), (2, 1, 1), margins, 0.03)
+    frames = [_frame(panel) for panel in panels]
+    widths = [x2 - x1 for x1, _, x2, _ in frames]
+    assert widths == pytest.approx([0.395, 0.1975, 0.1975])
+    assert frames[0][0] == pytest.approx(0.1)
+    assert frames[-1][2] == pytest.approx(0.95)
+    for (_, _, x2, _), (x1, _, _, _) in zip(frames, frames[1:]):
+        assert x1 - x2 == pytest.approx(0.03)
+    for previous, panel in zip(panels, panels[1:]):
+        assert previous.bounds[2] == pytest.approx(panel.bounds[0])
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+
+# The modules a restyle tool imports before it needs a canvas, e.g. to print --help.
+MODULES = [
+    'vhbbtools.plotting',
+    'vhbbtools.plotting.batch',
+    'vhbbtools.plotting.decorations',
+    'vhbbtools.plotting.styles',
+    'vhbbtools.plotting.transforms',
+]
+
+# The seconds importing them may take, far less than the multi-second PyROOT startup.
+IMPORT_BUDGET = 1.0
+
+
+def _run(source):
+    # A fresh interpreter, since the other tests may have imported ROOT already.
+    return subprocess.check_output([sys.executable, '-c', source]).decode('utf-8').strip()
+
+
+def test_import_does_not_load_root():
+    loaded = _run('\n'.join(
+        ['import sys'] + ['import ' + module for module in MODULES] +
+        ["print(','.join(sorted(name for name in ('ROOT', 'rootpy') if name in sys.modules)))"]
+    ))
+    assert loaded == ''
+
+
+def test_import_time_within_budget():
+    seconds = float(_run('\n'.join(
+        ['from timeit import default_timer', 'start = default_timer()'] +
+        ['import ' + module for module in MODULES] +
+        ['print(default_timer() - start)']
+    )))
+    assert seconds < IMPORT_BUDGET
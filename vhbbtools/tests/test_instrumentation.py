@@ -0,0 +1,79 @@
+import json
+import os
+
+import pytest
+
+from vhbbtools import instrumentation
+from vhbbtools.instrumentation import Report, count, record, stage
+
+
+def test_record_stages_and_counters():
+    with record('input.root') as recorder:
+        with stage('read'):
+            pass
+        with stage('read'):
+            count('clones', 2)
+        count('primitives')
+    metrics = recorder.metrics()
+    assert metrics['stages']['read']['calls'] == 2
+    assert metrics['stages']['file']['calls'] == 1
+    assert metrics['stages']['file']['seconds'] >= metrics['stages']['read']['seconds']
+    assert metrics['counters'] == {'clones': 2, 'primitives': 1}
+
+
+def test_disabled_record_does_nothing():
+    with record('input.root', enabled=False) as recorder:
+        assert stage('read') is instrumentation._NULL_STAGE
+        count('clones')
+    assert recorder is None
+
+
+def _metrics(stages, counters):
+    return {
+        'stages': {
+            name: {'calls': calls, 'seconds': seconds, 'max': longest}
+            for name, (calls, seconds, longest) in stages.items()
+        },
+        'counters': counters,
+    }
+
+
+def test_report_aggregates_files(tmpdir):
+    report = Report([
+        ('a.root', _metrics({'file': (1, 2., 2.), 'read': (2, 1., 0.75)}, {'clones': 3})),
+        ('b.root', None),
+        ('c.root', _metrics({'file': (1, 4., 4.)}, {'clones': 1, 'primitives': 5})),
+    ])
+    totals = report.to_dict()
+    assert totals['files'] == 2
+    assert totals['stages']['file'] == {'calls': 2, 'seconds': 6., 'max': 4., 'mean': 3.}
+    assert totals['stages']['read'] == {'calls': 2, 'seconds': 1., 'max': 0.75, 'mean': 0.5}
+    assert totals['counters'] == {'clones': 4, 'primitives': 5}
+    assert sorted(totals['per_file']) == ['a.root', 'c.root']
+    lines = report.table().splitlines()
+    assert lines[1].split()[0] == 'file'
+    assert lines[2].split()[0] == 'read'
+    path = str(tmpdir.join('report.json'))
+    report.to_json(path)
+    with open(path) as f:
+        assert json.load(f) == totals
+
+
+def test_profiles_of_same_name_do_not_collide(tmpdir):
+    profile_dir = str(tmpdir.mkdir('profiles'))
+    paths = [os.path.join('first', 'input.root'), os.path.join('second', 'input.root')]
+    for path in paths:
+        with record(path, enabled=False, profile_dir=profile_dir):
+            pass
+    with record(paths[0], enabled=False, profile_dir=profile_dir):
+        pass
+    names = sorted(os.listdir(profile_dir))
+    assert len(names) == 2
+    for name in names:
+        assert name.startswith('input_') and name.endswith('.prof')
+
+
+def test_unknown_profiler():
+    with pytest.raises(ValueError):
+        with record('input.root', profile_dir='.', profiler='perf'):
+            pass
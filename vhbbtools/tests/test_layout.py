@@ -0,0 +1,72 @@
+import pytest
+
+from vhbbtools.plotting.decorations import layout
+from vhbbtools.plotting.decorations.exceptions import PositionError
+from vhbbtools.plotting.decorations.layout import cms_label_layout, luminosity_label_layout
+
+
+MARGINS = [(0.16, 0.02, 0.13, 0.08), (0.12, 0.04, 0.3, 0.1), (0.2, 0.05, 0.018, 0.08)]
+
+ALIGNS = {'left': 13, 'center': 23, 'right': 33, 'outside': 11}
+
+
+def _reference(margins, position, scale, padding, sublabel_scale, sublabel_padding):
+    """Compute the label and sublabel layouts as CMSLabel.draw did on the active pad
+    before the layouts were cached.
+    """
+    left_margin, right_margin, bottom_margin, top_margin = margins
+    padding_left, padding_right, padding_top = padding
+    size = scale * top_margin
+    frame_width = 1 - left_margin - right_margin
+    inside_y = 1 - top_margin - (padding_top or 0.035) * (1 - top_margin - bottom_margin)
+    x, y = {
+        'left': (left_margin + padding_left * frame_width, inside_y),
+        'center': (left_margin + 0.5 * frame_width, inside_y),
+        'right': (1 - right_margin - padding_right * frame_width, inside_y),
+        'outside': (left_margin, 1 - (padding_top or 0.8) * top_margin),
+    }[position]
+    if position == 'outside':
+        sublabel_x, sublabel_y = left_margin + sublabel_padding[0] * frame_width, y
+    else:
+        sublabel_x, sublabel_y = x, y - sublabel_padding[1] * size
+    return (x, y, size, ALIGNS[position]), (sublabel_x, sublabel_y, sublabel_scale * size, ALIGNS[position])
+
+
+@pytest.fixture(autouse=True)
+def empty_caches(monkeypatch):
+    monkeypatch.setattr(layout, '_CMS_LABEL_LAYOUTS', {})
+    monkeypatch.setattr(layout, '_LUMINOSITY_LABEL_LAYOUTS', {})
+
+
+@pytest.mark.parametrize('margins', MARGINS)
+@pytest.mark.parametrize('position', sorted(ALIGNS))
+@pytest.mark.parametrize('scale, padding', [(0.75, (0.045, 0.045, None)), (0.9, (0.03, 0.06, 0.05))])
+def test_cms_label_layout_matches_uncached(margins, position, scale, padding):
+    arguments = (margins, position, scale, padding, 0.76, (0.12, 1.2))
+    label, sublabel = _reference(*arguments)
+    first = cms_label_layout(*arguments)
+    assert first.label == pytest.approx(label)
+    assert first.sublabel == pytest.approx(sublabel)
+    # A list of margins hits the entry cached for the tuple.
+    assert cms_label_layout(list(margins), position, scale, list(padding), 0.76, [0.12, 1.2]) is first
+
+
+def test_cms_label_layout_distinguishes_arguments():
+    left = cms_label_layout(MARGINS[0], 'left')
+    assert cms_label_layout(MARGINS[1], 'left') != left
+    assert cms_label_layout(MARGINS[0], 'left', scale=0.9) != left
+    assert cms_label_layout(MARGINS[0], 'left') is left
+
+
+def test_cms_label_layout_rejects_unknown_position():
+    with pytest.raises(PositionError):
+        cms_label_layout(MARGINS[0], 'bottom')
+
+
+@pytest.mark.parametrize('margins', MARGINS)
+@pytest.mark.parametrize('scale, padding_top', [(0.6, 0.8), (0.5, 0.9)])
+def test_luminosity_label_layout_matches_uncached(margins, scale, padding_top):
+    _, right_margin, _, top_margin = margins
+    first = luminosity_label_layout(margins, scale, padding_top)
+    assert first == pytest.approx((1 - right_margin, 1 - padding_top * top_margin, scale * top_margin, 31))
+    assert luminosity_label_layout(list(margins), scale, padding_top) is first
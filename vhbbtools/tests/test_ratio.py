@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+ROOT = pytest.importorskip('ROOT')
+pytest.importorskip('rootpy')
+
+from vhbbtools.plotting.ratio import fill_ratio_pad
+from vhbbtools.plotting.transforms import load_spec
+from vhbbtools.plotting.transforms.spec import _PadTransform
+
+
+PUBSTYLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'pubstyle')
+
+
+def _lower_pad_spec(figure):
+    spec = load_spec(os.path.join(PUBSTYLE, figure, 'spec.yaml'))
+    return [pad for pad in spec['pads'] if pad['name'] == 'unten'][0]
+
+
+def _histograms():
+    ROOT.gROOT.SetBatch(True)
+    data = ROOT.TH1D('data', '', 10, 0., 1.)
+    stack = ROOT.THStack('stack', '')
+    for name, scale in (('background', 0.7), ('signal', 0.3)):
+        hist = ROOT.TH1D(name, '', 10, 0., 1.)
+        hist.Sumw2()
+        for i in range(1, 11):
+            hist.SetBinContent(i, scale * 10 * i)
+            hist.SetBinError(i, scale * i)
+        stack.Add(hist)
+    for i in range(1, 11):
+        data.SetBinContent(i, 10 * i + (-1) ** i)
+    return data, stack
+
+
+@pytest.mark.parametrize('figure, syst', [('PASFigure3', 0.1), ('ZllH', None)])
+def test_lower_pad_spec_applies_to_filled_pad(figure, syst):
+    data, stack = _histograms()
+    pad = ROOT.TPad('unten', 'unten', 0., 0., 1., 0.3)
+    added = fill_ratio_pad(pad, data, stack, syst)
+    state = _PadTransform(_lower_pad_spec(figure)).apply(pad, {'chi2': 1.}, True)
+    legend = state.index.get('TLegend')
+    assert legend is added[-1]
+    assert legend.GetListOfPrimitives()[-1].GetLabel() == 'MC Unc. (Stat.)'
+    assert added[0].GetMaximum() == pytest.approx(1.999)
@@ -0,0 +1,79 @@
+import pytest
+
+from vhbbtools.plotting.transforms.spec import _compile_arg, _PadState, _PadTransform
+
+from fake_root import TH1F, TLATEX, FakeObject, FakePad
+
+
+def _pad():
+    frame = FakeObject(TH1F, 'frame')
+    data = FakeObject(TH1F, 'data')
+    texts = [FakeObject(TLATEX, 'text{:d}'.format(i)) for i in range(3)]
+    pad = FakePad([(frame, 'HIST'), (data, 'E1SAME')] + [(text, '') for text in texts])
+    return pad, frame, data, texts
+
+
+# Remove every text and then raise only the last one, as the pubstyle specs do.
+REMOVE_THEN_RAISE = {
+    'name': 'oben',
+    'primitives': [
+        {'select': {'class': 'TLatex', 'index': ':'}, 'remove': True},
+        {'select': {'class': 'TLatex', 'index': 2}, 'raise': True, 'set': {'SetTitle': 'raised'}},
+    ],
+}
+
+
+@pytest.mark.parametrize('inplace', [True, False])
+def test_remove_then_raise(inplace):
+    pad, frame, data, texts = _pad()
+    _PadTransform(REMOVE_THEN_RAISE).apply(pad, {}, inplace)
+    contents = pad.primitives.contents()
+    assert contents[:2] == [(frame, 'HIST'), (data, 'E1SAME')]
+    assert len(contents) == 3
+    text, option = contents[2]
+    assert text.title == 'raised'
+    assert (text is texts[2]) == inplace
+
+
+def test_inplace_option_keeps_axis_histogram():
+    pad, frame, data, texts = _pad()
+    spec = {'name': 'oben', 'primitives': [{'select': 0, 'option': 'HISTSAME'}]}
+    _PadTransform(spec).apply(pad, {}, True)
+    contents = pad.primitives.contents()
+    assert contents[0] == (frame, 'AXIS')
+    assert contents[-1] == (frame, 'HISTSAME')
+
+
+def test_inplace_raise_twice_removes_the_top_link():
+    pad, frame, data, texts = _pad()
+    spec = {'name': 'oben', 'primitives': [{'select': 0, 'raise': True}, {'select': 0, 'raise': True}]}
+    _PadTransform(spec).apply(pad, {}, True)
+    contents = pad.primitives.contents()
+    assert contents[0] == (frame, 'AXIS')
+    assert contents.count((frame, 'HIST')) == 1
+    assert contents[-1] == (frame, 'HIST')
+
+
+class _Axis(object):
+
+    def GetFirst(self):
+        return 3
+
+    def GetLast(self):
+        return 8
+
+    def GetBinLowEdge(self, bin):
+        return 0.1 * (bin - 1)
+
+    def GetBinUpEdge(self, bin):
+        return 0.1 * bin
+
+
+def test_reference_getter_with_arguments():
+    hist = FakeObject(TH1F, 'ratio')
+    hist.GetXaxis = _Axis
+    state = _PadState(FakePad([(FakeObject(TH1F, 'frame'), ''), (hist, 'E1SAME')]), {}, True)
+    low = _compile_arg({'select': 1, 'get': 'GetXaxis.GetBinLowEdge', 'args': {'select': 1, 'get': 'GetXaxis.GetFirst'}})
+    high = _compile_arg({'select': 1, 'get': 'GetXaxis.GetBinUpEdge', 'args': {'select': 1, 'get': 'GetXaxis.GetLast'}})
+    assert low.resolve(state) == pytest.approx(0.2)
+    assert high.resolve(state) == pytest.approx(0.8)
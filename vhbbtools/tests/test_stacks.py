@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from vhbbtools.stacks import StackArray
+
+
+def _stack_array(edges, contents):
+    """Return a StackArray holding the given cells, including the underflow and overflow,
+    without reading them from a THStack. The variances equal the contents.
+    """
+    stack_array = StackArray.__new__(StackArray)
+    stack_array.names = ['component{:d}'.format(i) for i in range(len(contents))]
+    stack_array.edges = np.asarray(edges, dtype=np.float64)
+    stack_array.contents = np.asarray(contents, dtype=np.float64)
+    stack_array.variances = stack_array.contents.copy()
+    stack_array._rebinned = False
+    return stack_array
+
+
+@pytest.fixture
+def stack_array():
+    # Two components with six bins between the underflow and overflow.
+    return _stack_array(
+        np.linspace(0., 6., 7),
+        [[1, 1, 2, 3, 4, 5, 6, 1], [2, 0, 1, 0, 1, 0, 1, 3]],
+    )
+
+
+def test_rebin_ngroup(stack_array):
+    stack_array.rebin(2)
+    np.testing.assert_array_equal(stack_array.edges, [0., 2., 4., 6.])
+    np.testing.assert_array_equal(stack_array.contents, [[1, 3, 7, 11, 1], [2, 1, 1, 1, 3]])
+    np.testing.assert_array_equal(stack_array.variances, stack_array.contents)
+    assert stack_array._rebinned
+
+
+def test_rebin_ngroup_of_all_bins(stack_array):
+    stack_array.rebin(6)
+    np.testing.assert_array_equal(stack_array.edges, [0., 6.])
+    np.testing.assert_array_equal(stack_array.contents, [[1, 21, 1], [2, 3, 3]])
+
+
+def test_rebin_edges_merges_outside_into_flow(stack_array):
+    stack_array.rebin(edges=[1., 3., 4.])
+    np.testing.assert_array_equal(stack_array.contents, [[2, 5, 4, 12], [2, 1, 1, 4]])
+    np.testing.assert_array_equal(stack_array.bins.sum(axis=1), [9, 2])
+
+
+@pytest.mark.parametrize('ngroup', [None, 0, -2, 4, 7, 1.5])
+def test_rebin_rejects_invalid_ngroup(stack_array, ngroup):
+    with pytest.raises(ValueError):
+        stack_array.rebin(ngroup)
+    np.testing.assert_array_equal(stack_array.edges, np.linspace(0., 6., 7))
+
+
+@pytest.mark.parametrize('edges', [[1.], [3., 1.], [0.5, 2.], [0., 7.]])
+def test_rebin_rejects_invalid_edges(stack_array, edges):
+    with pytest.raises(ValueError):
+        stack_array.rebin(edges=edges)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+ROOT = pytest.importorskip('ROOT')
+
+from vhbbtools.stats import chi2_ndf, ks_test
+
+
+# Weighted MC with a bin empty in both histograms, a data bin whose MC is empty and
+# without error, and an empty data bin whose MC is not.
+DATA = [0, 5, 12, 20, 9, 3, 0, 1]
+MC = [0., 6.2, 10.5, 21.3, 8.1, 0., 0.8, 1.4]
+MC_ERRORS = [0., 1.1, 1.5, 2.0, 1.2, 0., 0.4, 0.5]
+
+
+def _hist(name, contents, errors=None):
+    hist = ROOT.TH1D(name, name, len(contents), 0., 1.)
+    hist.SetDirectory(0)
+    for i, content in enumerate(contents, 1):
+        hist.SetBinContent(i, content)
+        if errors is not None:
+            hist.SetBinError(i, errors[i - 1])
+    hist.ResetStats()
+    return hist
+
+
+@pytest.fixture
+def hists():
+    return _hist('data', DATA), _hist('mc', MC, MC_ERRORS)
+
+
+def test_chi2_ndf_matches_root(hists):
+    data, mc = hists
+    assert chi2_ndf(data, mc) == pytest.approx(data.Chi2Test(mc, 'UW CHI2/NDF'), rel=1e-6)
+
+
+def test_ks_test_matches_root(hists):
+    data, mc = hists
+    assert ks_test(data, mc) == pytest.approx(data.KolmogorovTest(mc), rel=1e-6)
+
+
+def test_batch_matches_single(hists):
+    data, mc = hists
+    other_data = _hist('other_data', DATA[::-1])
+    other_mc = _hist('other_mc', MC[::-1], MC_ERRORS[::-1])
+    np.testing.assert_allclose(
+        chi2_ndf([data, other_data], [mc, other_mc]),
+        [chi2_ndf(data, mc), chi2_ndf(other_data, other_mc)],
+    )
+    np.testing.assert_allclose(
+        ks_test([data, other_data], [mc, other_mc]),
+        [ks_test(data, mc), ks_test(other_data, other_mc)],
+    )
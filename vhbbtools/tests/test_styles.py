@@ -0,0 +1,19 @@
+import pytest
+
+ROOT = pytest.importorskip('ROOT')
+pytest.importorskip('rootpy')
+
+from vhbbtools.plotting.styles import get_style, use_style
+
+
+def test_use_style_undoes_changes_on_exit():
+    style = get_style('tdrStyle')
+    end_error_size = style.GetEndErrorSize()
+    with use_style('tdrStyle'):
+        ROOT.gStyle.SetEndErrorSize(end_error_size + 5)
+        with use_style('tdrStyle'):
+            pass
+        # Leaving a nested context keeps the changes of the outer one.
+        assert style.GetEndErrorSize() == end_error_size + 5
+    assert get_style('tdrStyle') is style
+    assert style.GetEndErrorSize() == end_error_size
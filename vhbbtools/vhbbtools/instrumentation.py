@@ -0,0 +1,248 @@
+import hashlib
+import json
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from timeit import default_timer
+
+
+__all__ = [
+    'Recorder',
+    'Report',
+    'count',
+    'record',
+    'stage',
+]
+
+
+# The recorder of the file being restyled by each thread, if instrumentation is on.
+# Timers and counters check it first, so they cost next to nothing while it is off.
+# It is per thread so that a background reader (see vhbbtools.io.Prefetcher) does not
+# add its timings to the file being restyled on the main thread.
+_state = threading.local()
+_state.recorder = None
+
+
+class _NullStage(object):
+    """A timer which does nothing, used while instrumentation is off.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage(object):
+    """A timer adding the time spent within its context to a stage of a recorder.
+    """
+    __slots__ = ('recorder', 'name', 'start')
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = default_timer()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.recorder.add(self.name, default_timer() - self.start)
+        return False
+
+
+def stage(name):
+    """Return a context manager timing a stage of restyling, e.g. 'read' or 'transform',
+    for the current recorder. Stages nest, so the time of a stage includes the time of
+    the stages within it.
+    """
+    recorder = getattr(_state, 'recorder', None)
+    if recorder is None:
+        return _NULL_STAGE
+    return _Stage(recorder, name)
+
+
+def count(name, n=1):
+    """Add to a counter of the current recorder, e.g. of the primitives cloned.
+    """
+    recorder = getattr(_state, 'recorder', None)
+    if recorder is not None:
+        recorder.counters[name] += n
+
+
+class Recorder(object):
+    """The stage timings and counters of restyling a single file.
+
+    The following attributes are available:
+    * stages : dict
+      The number of calls, total seconds, and longest call of each stage, keyed by name.
+
+    * counters : dict
+      The value of each counter, keyed by name.
+    """
+    def __init__(self):
+        self.stages = {}
+        self.counters = defaultdict(int)
+
+    def add(self, name, seconds):
+        """Add a call of a stage lasting the given number of seconds.
+        """
+        try:
+            calls, total, longest = self.stages[name]
+        except KeyError:
+            calls, total, longest = 0, 0., 0.
+        self.stages[name] = (calls + 1, total + seconds, max(longest, seconds))
+
+    def metrics(self):
+        """Return the timings and counters as a JSON-serializable dict.
+        """
+        return {
+            'stages': {
+                name: {'calls': calls, 'seconds': total, 'max': longest}
+                for name, (calls, total, longest) in self.stages.items()
+            },
+            'counters': dict(self.counters),
+        }
+
+
+def _start_profiler(profiler):
+    """Start and return a profiler of the given kind, either 'cprofile' or 'pyinstrument'.
+    """
+    if profiler == 'cprofile':
+        import cProfile
+        instance = cProfile.Profile()
+        instance.enable()
+        return instance
+    if profiler == 'pyinstrument':
+        try:
+            import pyinstrument
+        except ImportError:
+            raise ImportError('Profiling with pyinstrument requires the pyinstrument package.')
+        instance = pyinstrument.Profiler()
+        instance.start()
+        return instance
+    raise ValueError('Unrecognized profiler: {}'.format(profiler))
+
+
+def _dump_profile(instance, path, profile_dir):
+    """Stop a profiler and save its profile of restyling a file into a directory, as a
+    .prof file for pstats or snakeviz with cProfile, or an .html page with pyinstrument.
+    The file is named after the file restyled and a short hash of its absolute path, so
+    that files of the same name in different directories get profiles of their own.
+    """
+    absolute = os.path.abspath(path)
+    if not isinstance(absolute, bytes):
+        absolute = absolute.encode('utf-8')
+    digest = hashlib.sha1(absolute).hexdigest()[:8]
+    name = '{}_{}'.format(os.path.splitext(os.path.basename(path))[0], digest)
+    if hasattr(instance, 'dump_stats'):
+        instance.disable()
+        instance.dump_stats(os.path.join(profile_dir, name + '.prof'))
+    else:
+        instance.stop()
+        with open(os.path.join(profile_dir, name + '.html'), 'w') as f:
+            f.write(instance.output_html())
+
+
+@contextmanager
+def record(path, enabled=True, profile_dir=None, profiler='cprofile'):
+    """Record the timings and counters of restyling a file within the context, which
+    yields the Recorder or None if disabled. The whole context is timed as the stage
+    'file'.
+
+    Parameters
+    ----------
+    path : string
+        The path to the file, which names its profile.
+
+    enabled : bool, optional
+        Whether to record the timings and counters. The default is True.
+
+    profile_dir : string, optional
+        The directory in which to save a profile of the context. The default is None
+        for no profile.
+
+    profiler : string, optional
+        The profiler, either 'cprofile' or 'pyinstrument'. The default is 'cprofile'.
+    """
+    recorder = Recorder() if enabled else None
+    previous = getattr(_state, 'recorder', None)
+    _state.recorder = recorder
+    instance = _start_profiler(profiler) if profile_dir is not None else None
+    try:
+        with stage('file'):
+            yield recorder
+    finally:
+        _state.recorder = previous
+        if instance is not None:
+            _dump_profile(instance, path, profile_dir)
+
+
+class Report(object):
+    """The timings and counters of a batch, aggregated over the files.
+
+    Parameters
+    ----------
+    metrics : iterable of (string, dict) pairs
+        The path to each file and its metrics (see Recorder.metrics).
+    """
+    def __init__(self, metrics):
+        self.files = [(path, file_metrics) for path, file_metrics in metrics if file_metrics is not None]
+
+    @classmethod
+    def from_results(cls, results):
+        """Create the report from the results of batch.run with instrumentation on.
+        """
+        return cls((result.path, result.metrics) for result in results)
+
+    def to_dict(self):
+        """Return the report as a JSON-serializable dict with the totals of each stage
+        and counter and the metrics of each file.
+        """
+        stages = {}
+        counters = defaultdict(int)
+        for _, file_metrics in self.files:
+            for name, timing in file_metrics['stages'].items():
+                total = stages.setdefault(name, {'calls': 0, 'seconds': 0., 'max': 0.})
+                total['calls'] += timing['calls']
+                total['seconds'] += timing['seconds']
+                total['max'] = max(total['max'], timing['max'])
+            for name, value in file_metrics['counters'].items():
+                counters[name] += value
+        for total in stages.values():
+            total['mean'] = total['seconds'] / total['calls']
+        return {
+            'files': len(self.files),
+            'stages': stages,
+            'counters': dict(counters),
+            'per_file': dict(self.files),
+        }
+
+    def to_json(self, path):
+        """Save the report to a JSON file.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+
+    def table(self):
+        """Return the report as a text table of the stages, slowest first, followed by
+        the counters.
+        """
+        report = self.to_dict()
+        lines = ['{:<24} {:>8} {:>12} {:>12} {:>12}'.format('stage', 'calls', 'total [s]', 'mean [ms]', 'max [ms]')]
+        for name, total in sorted(report['stages'].items(), key=lambda item: -item[1]['seconds']):
+            lines.append('{:<24} {:>8d} {:>12.3f} {:>12.3f} {:>12.3f}'.format(
+                name, total['calls'], total['seconds'], 1e3 * total['mean'], 1e3 * total['max']))
+        if report['counters']:
+            lines.append('')
+            lines.append('{:<24} {:>8}'.format('counter', 'value'))
+            for name, value in sorted(report['counters'].items()):
+                lines.append('{:<24} {:>8d}'.format(name, value))
+        return '\n'.join(lines)
@@ -0,0 +1,3 @@
+from .arrays import GraphArrays, HistogramArrays, PadArrays, StackArrays, read_canvas
+from .keys import iter_objects
+from .prefetch import Prefetcher, prefetch_objects
@@ -0,0 +1,174 @@
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+
+__all__ = [
+    'GraphArrays',
+    'HistogramArrays',
+    'PadArrays',
+    'StackArrays',
+    'read_canvas',
+]
+
+
+# The bin edges of a 1-D histogram and the contents and squared errors of its bins,
+# excluding the underflow and overflow.
+HistogramArrays = namedtuple('HistogramArrays', ['name', 'class_name', 'edges', 'contents', 'variances'])
+
+# The component histograms of a THStack in stacking order, as 2-D arrays of shape
+# (components, bins) like vhbbtools.stacks.StackArray but without the underflow and overflow.
+StackArrays = namedtuple('StackArrays', ['name', 'names', 'edges', 'contents', 'variances'])
+
+# The points of a graph and their low and high errors, which are zero for a TGraph and
+# equal for a TGraphErrors.
+GraphArrays = namedtuple(
+    'GraphArrays',
+    ['name', 'class_name', 'x', 'y', 'x_low', 'x_high', 'y_low', 'y_high'],
+)
+
+# The histograms, stacks, and graphs drawn on a pad, each in drawing order.
+PadArrays = namedtuple('PadArrays', ['name', 'histograms', 'stacks', 'graphs'])
+
+
+def _text(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+def _member(obj, name):
+    """Return a data member of an object read by uproot 4 or later, or by uproot 3.
+    """
+    if hasattr(obj, 'member'):
+        return obj.member(name)
+    return getattr(obj, '_' + name)
+
+
+def _has_member(obj, name):
+    if hasattr(obj, 'has_member'):
+        return obj.has_member(name)
+    return hasattr(obj, '_' + name)
+
+
+def _class_name(obj):
+    class_name = getattr(obj, 'classname', None) or getattr(obj, '_classname', None)
+    return _text(class_name or type(obj).__name__)
+
+
+def _histogram(obj):
+    name = _text(_member(obj, 'fName'))
+    if hasattr(obj, 'allvalues'):
+        edges, contents, variances = obj.edges, obj.values, obj.variances
+    else:
+        edges, contents, variances = obj.axis().edges(), obj.values(flow=False), obj.variances(flow=False)
+    return HistogramArrays(
+        name,
+        _class_name(obj),
+        np.asarray(edges, dtype=np.float64),
+        np.asarray(contents, dtype=np.float64),
+        np.asarray(variances, dtype=np.float64),
+    )
+
+
+def _stack(obj):
+    hists = [_histogram(hist) for hist in _member(obj, 'fHists') or []]
+    if not hists:
+        raise ValueError('The stack has no histograms.')
+    return StackArrays(
+        _text(_member(obj, 'fName')),
+        [hist.name for hist in hists],
+        hists[0].edges,
+        np.vstack([hist.contents for hist in hists]),
+        np.vstack([hist.variances for hist in hists]),
+    )
+
+
+# The data members holding the low and high x and y errors of each graph class.
+_GRAPH_ERRORS = {
+    'TGraphErrors': ('fEX', 'fEX', 'fEY', 'fEY'),
+    'TGraphAsymmErrors': ('fEXlow', 'fEXhigh', 'fEYlow', 'fEYhigh'),
+}
+
+
+def _graph(obj):
+    class_name = _class_name(obj)
+    npoints = _member(obj, 'fNpoints')
+    x = np.asarray(_member(obj, 'fX'), dtype=np.float64)[:npoints]
+    y = np.asarray(_member(obj, 'fY'), dtype=np.float64)[:npoints]
+    if class_name in _GRAPH_ERRORS:
+        errors = [
+            np.asarray(_member(obj, member), dtype=np.float64)[:npoints]
+            for member in _GRAPH_ERRORS[class_name]
+        ]
+    else:
+        errors = [np.zeros(npoints)] * 4
+    return GraphArrays(_text(_member(obj, 'fName')), class_name, x, y, *errors)
+
+
+def _read_pad(pad, pads):
+    """Add the contents of a pad and its subpads to an ordered dict keyed by pad name.
+    """
+    histograms, stacks, graphs = [], [], []
+    for obj in _member(pad, 'fPrimitives') or []:
+        class_name = _class_name(obj)
+        if class_name.startswith('TH1') or class_name == 'TProfile':
+            histograms.append(_histogram(obj))
+        elif class_name == 'THStack':
+            stacks.append(_stack(obj))
+        elif class_name.startswith('TGraph'):
+            graphs.append(_graph(obj))
+        elif _has_member(obj, 'fPrimitives'):
+            _read_pad(obj, pads)
+    name = _text(_member(pad, 'fName'))
+    if histograms or stacks or graphs:
+        pads[name] = PadArrays(name, histograms, stacks, graphs)
+
+
+def read_canvas(source, name=None):
+    """Read the histograms, stacks, and graphs drawn on a canvas stored in a ROOT file
+    into NumPy arrays with uproot, without starting ROOT, e.g. for computing statistics,
+    yield tables, or cache keys in worker pools which never draw.
+
+    The pads holding any of them are read in drawing order, depth first, so a ratio plot
+    yields its upper and lower pads, e.g. 'oben' and 'unten'. Other primitives, such as
+    frames, legends, and texts, are skipped.
+
+    uproot is an optional dependency, which is only imported when reading. Both uproot 3
+    and uproot 4 or later are supported.
+
+    Parameters
+    ----------
+    source : string or uproot directory
+        The path to the .root file, or a file or directory opened with uproot.
+
+    name : string, optional
+        The name of the canvas. The default is None for the first canvas in the file.
+
+    Returns
+    -------
+    pads : OrderedDict of PadArrays
+        The contents of each pad, keyed by its name.
+    """
+    if isinstance(source, basestring):
+        try:
+            import uproot
+        except ImportError:
+            raise ImportError('Reading without ROOT requires the uproot package.')
+        directory = uproot.open(source)
+    else:
+        directory = source
+    try:
+        if name is None:
+            classnames = directory.classnames()
+            items = classnames.items() if isinstance(classnames, dict) else classnames
+            for key, class_name in items:
+                if _text(class_name) == 'TCanvas':
+                    name = _text(key).split(';')[0]
+                    break
+            else:
+                raise KeyError('No canvas in {!r}'.format(source))
+        pads = OrderedDict()
+        _read_pad(directory[name], pads)
+        return pads
+    finally:
+        if directory is not source and hasattr(directory, 'close'):
+            directory.close()
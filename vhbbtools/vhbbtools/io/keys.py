@@ -0,0 +1,77 @@
+import fnmatch
+
+from ..instrumentation import stage
+
+
+__all__ = [
+    'iter_objects',
+]
+
+
+def iter_objects(source, cls='TCanvas', pattern='*', recursive=False):
+    """Generate the objects of a class stored in a ROOT file, one at a time.
+
+    The keys are iterated in place rather than copied into a list, and an object is only
+    read once the previous one has been consumed. Each object is owned by Python, so it
+    is deleted as soon as no references to it are left, which keeps the memory bounded
+    by the largest object rather than the size of the file. Only the latest cycle of
+    each key is read.
+
+    Parameters
+    ----------
+    source : string or TDirectory
+        The path to the .root file, or an open file or directory.
+
+    cls : string, optional
+        The name of the class of the objects, which also matches its subclasses.
+        The default is 'TCanvas'.
+
+    pattern : string, optional
+        A shell-style pattern, e.g. 'Zll_*', which the path of a key within the file
+        must match. The default is '*' for every key.
+
+    recursive : bool, optional
+        Whether to descend into subdirectories, whose keys have paths like 'dir/name'.
+        The default is False.
+
+    Yields
+    ------
+    path, obj : string, TObject
+        The path of each matching key within the file and the object read from it.
+    """
+    if isinstance(source, basestring):
+        from rootpy.io import root_open
+        with stage('open'):
+            f = root_open(source)
+        with f:
+            for item in _iter_directory(f, cls, pattern, recursive, ''):
+                yield item
+    else:
+        for item in _iter_directory(source, cls, pattern, recursive, ''):
+            yield item
+
+
+def _iter_directory(directory, cls, pattern, recursive, prefix):
+    """Generate the matching objects of a directory and, if recursive, its subdirectories.
+    """
+    from rootpy import ROOT
+    seen = set()
+    for key in directory.GetListOfKeys():
+        name = key.GetName()
+        if name in seen:
+            continue
+        seen.add(name)
+        path = prefix + name
+        tclass = ROOT.TClass.GetClass(key.GetClassName())
+        if not tclass:
+            continue
+        if tclass.InheritsFrom(cls):
+            if fnmatch.fnmatchcase(path, pattern):
+                with stage('read'):
+                    obj = key.ReadObj()
+                ROOT.SetOwnership(obj, True)
+                yield path, obj
+                del obj
+        elif recursive and tclass.InheritsFrom('TDirectory'):
+            for item in _iter_directory(key.ReadObj(), cls, pattern, recursive, path + '/'):
+                yield item
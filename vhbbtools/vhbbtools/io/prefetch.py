@@ -0,0 +1,172 @@
+import Queue
+import threading
+import traceback
+
+from .keys import iter_objects
+
+
+__all__ = [
+    'Prefetcher',
+    'prefetch_objects',
+]
+
+
+# Marks the end of the items in the queue of a Prefetcher.
+_DONE = object()
+
+
+class Prefetcher(object):
+    """Iterate over an iterable on a background thread, keeping up to a fixed number of
+    its items ready in a bounded queue, so that producing the next items, e.g. reading
+    them from a network filesystem, overlaps with consuming the current one.
+
+    An exception raised by the iterable is raised again by the iteration over the
+    prefetcher once the items before it have been consumed. Closing the prefetcher, or
+    leaving it as a context manager, stops the background thread early.
+
+    Parameters
+    ----------
+    iterable : iterable
+        The items, which are produced on the background thread.
+
+    size : int, optional
+        The number of items kept ready. The default is 2.
+    """
+    def __init__(self, iterable, size=2):
+        if size < 1:
+            raise ValueError('The prefetch size must be at least 1, got: {!r}'.format(size))
+        self._queue = Queue.Queue(size)
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._produce, args=(iterable,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _put(self, item):
+        """Put an item into the queue, waiting for space unless the prefetcher is closed.
+        Return whether the item was put.
+        """
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+            except Queue.Full:
+                continue
+            return True
+        return False
+
+    def _produce(self, iterable):
+        try:
+            for item in iterable:
+                if not self._put((item, None)):
+                    return
+        except Exception as error:
+            self._put((_DONE, error))
+        else:
+            self._put((_DONE, None))
+
+    def __iter__(self):
+        while True:
+            item, error = self._queue.get()
+            if item is _DONE:
+                self._thread.join()
+                if error is not None:
+                    raise error
+                return
+            yield item
+
+    def close(self):
+        """Stop the background thread, dropping the items not yet consumed.
+        """
+        self._closed.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except Queue.Empty:
+                break
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+
+def _read_contents(paths):
+    """Generate the path to each file along with its contents and None, or None and the
+    formatted traceback if reading it failed. Only Python's file reading is involved, so
+    this is safe to run on a background thread.
+    """
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                contents = f.read()
+        except Exception:
+            yield path, None, traceback.format_exc()
+        else:
+            yield path, contents, None
+
+
+def _read_objects(path, contents, cls, pattern, recursive, first):
+    """Return the list of objects read by iter_objects from the contents of a file.
+    """
+    from rootpy import ROOT
+    f = ROOT.TMemFile(path, contents, len(contents), 'READ')
+    try:
+        if f.IsZombie():
+            raise IOError('Could not open {}'.format(path))
+        objects = []
+        items = iter_objects(f, cls, pattern, recursive)
+        try:
+            for item in items:
+                objects.append(item)
+                if first:
+                    break
+        finally:
+            items.close()
+        return objects
+    finally:
+        f.Close()
+
+
+def prefetch_objects(paths, cls='TCanvas', pattern='*', recursive=False, first=False, size=2):
+    """Read the objects of a class stored in several ROOT files, reading the contents of
+    up to size files ahead on a background thread (see Prefetcher and iter_objects).
+
+    Only the raw bytes of the files are read on the background thread, which releases
+    the GIL while waiting on e.g. a network filesystem. The objects are deserialised
+    from them in memory on the iterating thread, since ROOT's I/O is not safe to run
+    alongside the transforming and painting on the main thread.
+
+    Parameters
+    ----------
+    paths : iterable of strings
+        The paths to the .root files.
+
+    cls, pattern, recursive
+        The objects to read from each file (see iter_objects).
+
+    first : bool, optional
+        Whether to read only the first matching object of each file. The default is False.
+
+    size : int, optional
+        The number of files whose contents are kept ready. The default is 2.
+
+    Yields
+    ------
+    path, objects, error : string, list, string
+        The path to each file, the list of its (path, obj) pairs, and the formatted
+        traceback if reading the file failed, in which case the list is None. Closing
+        the generator stops the background thread.
+    """
+    with Prefetcher(_read_contents(paths), size) as prefetcher:
+        for path, contents, error in prefetcher:
+            if error is None:
+                try:
+                    objects = _read_objects(path, contents, cls, pattern, recursive, first)
+                except Exception:
+                    objects, error = None, traceback.format_exc()
+            else:
+                objects = None
+            del contents
+            yield path, objects, error
+            del objects
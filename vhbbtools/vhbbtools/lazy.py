@@ -0,0 +1,53 @@
+import importlib
+import sys
+import types
+
+
+__all__ = [
+    'LazyModule',
+    'lazy_import',
+]
+
+
+class LazyModule(types.ModuleType):
+    """A stand-in for a package module whose public attributes are only imported from
+    its submodules when they are first accessed. Importing such a package is therefore
+    cheap, e.g. ROOT is not loaded until a canvas or label is actually used.
+
+    Parameters
+    ----------
+    module : module
+        The package module to stand in for. Its attributes, e.g. __path__, are copied
+        so that its submodules can still be imported as usual.
+
+    attributes : dict
+        The relative names of the submodules defining the lazy attributes, keyed by the
+        attribute names, e.g. {'CMSCanvas': '.cms_canvas'}.
+    """
+    def __init__(self, module, attributes):
+        super(LazyModule, self).__init__(module.__name__, module.__doc__)
+        self.__dict__.update(module.__dict__)
+        self.__all__ = sorted(attributes)
+        # Keep a reference to the original module, since Python 2 clears the globals
+        # of a module once it is garbage collected.
+        self._module = module
+        self._lazy_attributes = attributes
+
+    def __getattr__(self, name):
+        try:
+            submodule = self._lazy_attributes[name]
+        except KeyError:
+            raise AttributeError("'module' object has no attribute '{}'".format(name))
+        value = getattr(importlib.import_module(submodule, self.__name__), name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self._lazy_attributes))
+
+
+def lazy_import(name, attributes):
+    """Replace the module of the given name by a LazyModule. Call it from the __init__.py
+    of a package as lazy_import(__name__, {...}) instead of importing from its submodules.
+    """
+    sys.modules[name] = LazyModule(sys.modules[name], attributes)
@@ -1 +1,12 @@
-from .cms_canvas import CMSCanvas
+from ..lazy import lazy_import
+
+
+lazy_import(__name__, {
+    'CMSCanvas': '.cms_canvas',
+    'CompositeCanvas': '.composite',
+    'PDFPacket': '.packet',
+    'decorate': '.decorations.pool',
+    'fill_ratio_pad': '.ratio',
+    'ratio_histogram': '.ratio',
+    'uncertainty_band': '.ratio',
+})
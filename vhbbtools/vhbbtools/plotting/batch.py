@@ -0,0 +1,387 @@
+import glob
+import multiprocessing
+import os
+import traceback
+from collections import namedtuple
+from multiprocessing.pool import ThreadPool
+
+from ..instrumentation import record, stage
+
+
+__all__ = [
+    'Result',
+    'read_manifest',
+    'restyle',
+    'run',
+]
+
+
+# The outcome of restyling a single .root file. Exactly one of outputs
+# and error is None, the latter holding the formatted traceback. The
+# metrics are None unless the batch is instrumented (see Recorder.metrics).
+Result = namedtuple('Result', ['path', 'outputs', 'error', 'metrics'])
+
+# The transform and instrumentation options used by a worker process. They are
+# set once by the pool initializer instead of being pickled along with every task.
+_worker_transform = None
+_worker_instrumentation = {}
+
+
+def read_manifest(path):
+    """Return the list of .root file paths in a manifest file.
+
+    The manifest lists one path or glob pattern per line. Relative paths are resolved
+    against the directory of the manifest, blank lines are skipped, and text after a
+    "#" is a comment, so entries can be switched off just as in the restyle.py scripts.
+    Glob patterns expand to their matches in sorted order.
+
+    Parameters
+    ----------
+    path : string
+        The path to the manifest file.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    paths = []
+    with open(path) as f:
+        for line in f:
+            entry = line.split('#', 1)[0].strip()
+            if not entry:
+                continue
+            entry = os.path.join(base, os.path.expanduser(entry))
+            if glob.has_magic(entry):
+                paths.extend(sorted(glob.glob(entry)))
+            else:
+                paths.append(entry)
+    return paths
+
+
+def restyle(
+    path,
+    transform,
+    output_dir=None,
+    suffix='_restyled',
+    formats=('pdf',),
+    pool=None,
+    pattern=None,
+    cache=None,
+    canvases=None,
+    packet=None,
+):
+    """Restyle the canvases stored in a .root file and save the results. The canvases
+    are streamed from the file one at a time (see vhbbtools.io.iter_objects).
+
+    Parameters
+    ----------
+    path : string
+        The path to the .root file.
+
+    transform : BaseTransform
+        The transform porting the old canvas over to the new CMSCanvas.
+
+    output_dir : string, optional
+        The directory in which to save the restyled figure. The default is None
+        for the directory of the .root file.
+
+    suffix : string, optional
+        The suffix appended to the name of the .root file. The default is '_restyled'.
+
+    formats : iterable of strings, optional
+        The file extensions, which determine the output formats. The figure is saved in
+        all of them from a single update of the canvas. The default is ('pdf',).
+
+    pool : multiprocessing.pool.ThreadPool, optional
+        A thread pool on which to write the raster formats in the background (see
+        CMSCanvas.export). The default is None.
+
+    pattern : string, optional
+        A shell-style pattern for the paths of the canvases within the file, including
+        those in subdirectories. Every matching canvas is restyled and saved under the
+        name of the .root file followed by an underscore and its path. The default is
+        None for restyling only the first canvas and saving it under the name of the file.
+
+    cache : OutputCache, optional
+        The cache from which to copy the figures instead of restyling them if neither
+        the .root file nor anything else determining them changed since they were last
+        stored. The default is None for always restyling.
+
+    canvases : list of (string, TCanvas) pairs, optional
+        The canvases of the file matching the pattern along with their paths, already
+        read e.g. by vhbbtools.io.prefetch_objects. The default is None for reading them.
+
+    packet : PDFPacket, optional
+        A multi-page PDF onto which each restyled canvas is also printed, bookmarked
+        with the name of the .root file. The figures are then always restyled, even if
+        they are in the cache. The default is None.
+
+    Returns
+    -------
+    outputs : list of strings or list of AsyncResult
+        The paths to the restyled figures, or with a pool, an AsyncResult for the paths
+        of each canvas.
+    """
+    # ROOT is imported on first use so that importing this module stays fast.
+    from rootpy import ROOT
+    ROOT.gROOT.SetBatch(True)
+    name, _ = os.path.splitext(path)
+    if output_dir is not None:
+        name = os.path.join(output_dir, os.path.basename(name))
+    key = None
+    if cache is not None:
+        with stage('cache'):
+            key = cache.key(path, transform, {'suffix': suffix, 'formats': list(formats), 'pattern': pattern})
+    if key is not None and packet is None:
+        with stage('cache'):
+            outputs = cache.fetch(key, name)
+        if outputs is not None:
+            return outputs if pool is None else [pool.apply_async(list, (outputs,))]
+    outputs = _render(path, transform, name, suffix, formats, pool, pattern, canvases, packet)
+    if key is not None:
+        if pool is None:
+            with stage('cache'):
+                cache.store(key, outputs, name)
+        else:
+            outputs = [pool.apply_async(_store, (cache, key, outputs, name))]
+    return outputs
+
+
+def _render(path, transform, name, suffix, formats, pool, pattern, canvases, packet):
+    """Restyle the canvases stored in a .root file and save them (see restyle).
+    """
+    from ..io import iter_objects
+    from .cms_canvas import CMSCanvas
+    outputs = []
+    rendered = 0
+    streamed = canvases is None
+    if streamed:
+        canvases = iter_objects(path, 'TCanvas', pattern or '*', recursive=pattern is not None)
+    try:
+        for key_path, old_canvas in canvases:
+            basename = name
+            title = os.path.basename(path)
+            if pattern is not None:
+                basename = '{}_{}'.format(name, key_path.replace('/', '_'))
+                title = '{}: {}'.format(title, key_path)
+            with CMSCanvas(**transform.canvas_options) as new_canvas:
+                with stage('transform'):
+                    transform(old_canvas, new_canvas)
+                exported = new_canvas.export(basename + suffix, formats, pool)
+                if packet is not None:
+                    with stage('packet'):
+                        packet.add(new_canvas, title)
+            rendered += 1
+            if pool is None:
+                outputs.extend(exported)
+            else:
+                outputs.append(exported)
+            if pattern is None:
+                break
+    finally:
+        if streamed:
+            canvases.close()
+    if not rendered:
+        raise ValueError('No canvas matching {!r} in {}'.format(pattern or '*', path))
+    return outputs
+
+
+def _store(cache, key, pending, prefix):
+    """Wait for the figures of a .root file to be written and store them in the cache.
+    """
+    outputs = [output for result in pending for output in result.get()]
+    cache.store(key, outputs, prefix)
+    return outputs
+
+
+def _init_worker(transform, instrumentation=None):
+    """Prepare a worker process for restyling with the given transform and keyword
+    arguments of instrumentation.record, if the batch is instrumented.
+    """
+    global _worker_transform, _worker_instrumentation
+    from rootpy import ROOT
+    ROOT.gROOT.SetBatch(True)
+    _worker_transform = transform
+    _worker_instrumentation = instrumentation or {'enabled': False}
+
+
+def _restyle_worker(task):
+    """Restyle a single .root file within a worker process and report the result
+    instead of raising, so that one bad input does not abort the whole batch.
+    """
+    path, options = task
+    with record(path, **_worker_instrumentation) as recorder:
+        try:
+            outputs = restyle(path, _worker_transform, **options)
+        except Exception:
+            outputs, error = None, traceback.format_exc()
+        else:
+            error = None
+    return Result(path, outputs, error, recorder and recorder.metrics())
+
+
+def _restyle_background(path, transform, pool, options):
+    """Restyle a single .root file, leaving its raster formats to be written on a
+    thread pool, and return a function waiting for them to report the result.
+    """
+    with record(path, **_worker_instrumentation) as recorder:
+        try:
+            pending = restyle(path, transform, pool=pool, **options)
+        except Exception:
+            pending, error = None, traceback.format_exc()
+    # Only the restyling is recorded, as the writes overlap with the next file.
+    metrics = recorder and recorder.metrics()
+    if pending is None:
+        return lambda: Result(path, None, error, metrics)
+
+    def wait():
+        try:
+            return Result(path, [output for result in pending for output in result.get()], None, metrics)
+        except Exception:
+            return Result(path, None, traceback.format_exc(), metrics)
+    return wait
+
+
+def _run_serial(paths, transform, options, background, prefetch):
+    """Restyle a batch of .root files one after the other within the current process,
+    optionally writing the raster formats and reading the next files in the background
+    (see run).
+    """
+    items = ((path, None, None) for path in paths)
+    reader = None
+    if prefetch and paths:
+        from ..io import prefetch_objects
+        pattern = options.get('pattern')
+        reader = prefetch_objects(
+            paths,
+            'TCanvas',
+            pattern or '*',
+            recursive=pattern is not None,
+            first=pattern is None,
+            size=prefetch,
+        )
+        items = reader
+    pool = ThreadPool(1) if background else None
+    try:
+        pending = []
+        for path, canvases, error in items:
+            if error is not None:
+                pending.append(Result(path, None, error, None))
+                continue
+            file_options = options if canvases is None else dict(options, canvases=canvases)
+            if pool is None:
+                pending.append(_restyle_worker((path, file_options)))
+            else:
+                pending.append(_restyle_background(path, transform, pool, file_options))
+            del canvases, file_options
+        return [item if isinstance(item, Result) else item() for item in pending]
+    finally:
+        if reader is not None:
+            reader.close()
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
+def run(
+    manifest,
+    transform,
+    jobs=None,
+    maxtasksperchild=None,
+    background=False,
+    prefetch=0,
+    packet=None,
+    bookmarks=True,
+    instrument=False,
+    profile_dir=None,
+    profiler='cprofile',
+    **options
+):
+    """Restyle a batch of .root files over a pool of worker processes.
+
+    Each worker process runs its own ROOT interpreter, so the process-global gPad and
+    gStyle of one restyle never interfere with another.
+
+    Parameters
+    ----------
+    manifest : string or iterable of strings
+        Either the path to a manifest file (see read_manifest) or the .root file paths.
+
+    transform : BaseTransform
+        The transform applied to every file in the batch.
+
+    jobs : int, optional
+        The number of worker processes. The default is None for the number of CPUs.
+        Passing 1 restyles the files serially within the current process.
+
+    maxtasksperchild : int, optional
+        The number of files a worker process restyles before it is replaced by a fresh
+        one, which bounds the memory held by ROOT. The default is None for no limit.
+
+    background : bool, optional
+        Whether to write the raster formats on a background thread while the next file
+        is restyled. It only applies to serial runs, as the worker processes already
+        overlap their writes. The default is False.
+
+    prefetch : int, optional
+        The number of files whose contents are read ahead on a background thread while
+        the current file is restyled, which hides the latency of network filesystems.
+        Their canvases are still deserialised on the main thread. It only applies to
+        serial runs. The default is 0 for reading each file when it is restyled.
+
+    packet : string, optional
+        The path to a multi-page PDF into which every restyled canvas is printed in the
+        order of the manifest, in addition to the formats. The PDF is opened and closed
+        once, so the batch is then restyled serially. The default is None.
+
+    bookmarks : bool, optional
+        Whether to bookmark each page of the packet with the name of its .root file.
+        The default is True.
+
+    instrument : bool, optional
+        Whether to time the stages of restyling each file and count the primitives it
+        touches, reported in the metrics of its result (see instrumentation.Report).
+        The default is False, for which the timers cost next to nothing.
+
+    profile_dir : string, optional
+        The directory in which to save a profile of restyling each file, named after
+        the file and a short hash of its path. The default is None for no profiles.
+
+    profiler : string, optional
+        The profiler, either 'cprofile' or 'pyinstrument'. The default is 'cprofile'.
+
+    **options
+        Keyword arguments passed on to restyle.
+
+    Returns
+    -------
+    results : list of Result
+        The result for each file, in the order of the manifest.
+    """
+    if isinstance(manifest, basestring):
+        manifest = read_manifest(manifest)
+    if packet is not None:
+        from .packet import PDFPacket
+        packet = PDFPacket(packet, bookmarks)
+        options = dict(options, packet=packet)
+        jobs = 1
+    tasks = [(path, options) for path in manifest]
+    if jobs is None:
+        jobs = multiprocessing.cpu_count()
+    jobs = min(jobs, len(tasks))
+    instrumentation = None
+    if instrument or profile_dir is not None:
+        if profile_dir is not None and not os.path.isdir(profile_dir):
+            os.makedirs(profile_dir)
+        instrumentation = {'enabled': instrument, 'profile_dir': profile_dir, 'profiler': profiler}
+    if jobs <= 1:
+        _init_worker(transform, instrumentation)
+        try:
+            return _run_serial([path for path, _ in tasks], transform, options, background, prefetch)
+        finally:
+            if packet is not None:
+                packet.close()
+    pool = multiprocessing.Pool(jobs, _init_worker, (transform, instrumentation), maxtasksperchild)
+    try:
+        results = pool.map(_restyle_worker, tasks, chunksize=1)
+    finally:
+        pool.terminate()
+        pool.join()
+    return results
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from .. import __version__
+
+
+__all__ = [
+    'OutputCache',
+]
+
+
+# The number of bytes of an input file hashed at a time.
+CHUNK_SIZE = 1 << 20
+
+# The name of the file listing the outputs stored in a cache entry.
+MANIFEST = 'outputs.json'
+
+# The digests of the style parameters, keyed by the style name.
+_STYLE_DIGESTS = {}
+
+
+def _style_digest(name):
+    """Return a digest of all of the parameters of a registered style.
+    """
+    try:
+        return _STYLE_DIGESTS[name]
+    except KeyError:
+        pass
+    from rootpy import ROOT
+    from .styles import get_style
+    parameters = str(ROOT.TBufferJSON.ConvertToJSON(get_style(name)))
+    _STYLE_DIGESTS[name] = hashlib.sha256(parameters.encode('utf-8')).hexdigest()
+    return _STYLE_DIGESTS[name]
+
+
+def _entry_size(path):
+    """Return the total size of the files in a cache entry.
+    """
+    size = 0
+    for name in os.listdir(path):
+        try:
+            size += os.path.getsize(os.path.join(path, name))
+        except OSError:
+            pass
+    return size
+
+
+class OutputCache(object):
+    """A content-addressed cache of restyled figures, so that rerunning a batch only
+    renders the figures whose inputs changed.
+
+    A figure is keyed by a hash of the bytes of its .root file, the fingerprint of the
+    transform, the vhbbtools version, the parameters of the TDR style, and the options
+    determining the outputs. Each entry is a directory holding copies of the outputs
+    named relative to their common prefix, so that byte-identical inputs with different
+    names share an entry but each gets outputs under its own name. The least recently
+    used entries are evicted once the cache exceeds its size.
+
+    Parameters
+    ----------
+    directory : string
+        The directory of the cache, which is created if needed. It may be shared by
+        the worker processes of a batch and by successive runs.
+
+    max_size : int, optional
+        The size of the cache in bytes above which entries are evicted. The default is
+        1 GiB. Passing None never evicts entries.
+    """
+    def __init__(self, directory, max_size=1 << 30):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_size = max_size
+        # The running total of the sizes of the entries, counted on the first store, so
+        # that the cache is only rescanned once it exceeds its size.
+        self._size = None
+        if not os.path.isdir(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError:
+                if not os.path.isdir(self.directory):
+                    raise
+
+    def key(self, path, transform, options):
+        """Return the key of the figures restyled from a .root file, or None if the
+        transform cannot be cached.
+
+        Parameters
+        ----------
+        path : string
+            The path to the .root file.
+
+        transform : BaseTransform
+            The transform.
+
+        options : mapping
+            The JSON-serializable options determining the outputs, e.g. their formats.
+        """
+        fingerprint = transform.fingerprint()
+        if fingerprint is None:
+            return None
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+        for part in (fingerprint, __version__, _style_digest('tdrStyle'), json.dumps(options, sort_keys=True)):
+            digest.update(b'\0')
+            digest.update(part.encode('utf-8'))
+        return digest.hexdigest()
+
+    def fetch(self, key, prefix):
+        """Copy the outputs stored under a key to the paths starting with a prefix and
+        return the paths, or None on a cache miss.
+
+        Parameters
+        ----------
+        key : string
+            The key (see key).
+
+        prefix : string
+            The path shared by the outputs, e.g. the output directory joined with the
+            name of the .root file, which replaces the prefix they were stored with.
+        """
+        entry = os.path.join(self.directory, key)
+        try:
+            with open(os.path.join(entry, MANIFEST)) as f:
+                names = json.load(f)
+            outputs = []
+            for name in names:
+                output = prefix + name
+                shutil.copyfile(os.path.join(entry, name), output)
+                outputs.append(output)
+            # The modification time of an entry records when it was last used.
+            os.utime(entry, None)
+        except (IOError, OSError, ValueError):
+            return None
+        return outputs
+
+    def store(self, key, outputs, prefix):
+        """Store copies of the outputs under a key, then evict entries if necessary.
+        The entry is assembled aside and renamed into place, so that concurrent readers
+        never see it partially written.
+
+        Parameters
+        ----------
+        key : string
+            The key (see key).
+
+        outputs : list of strings
+            The paths to the outputs.
+
+        prefix : string
+            The path shared by the outputs (see fetch), which is stripped from their names.
+        """
+        for output in outputs:
+            if not output.startswith(prefix):
+                raise ValueError('Output {} does not start with {}'.format(output, prefix))
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=self.directory)
+        try:
+            names = [output[len(prefix):] for output in outputs]
+            for output, name in zip(outputs, names):
+                shutil.copyfile(output, os.path.join(staging, name))
+            with open(os.path.join(staging, MANIFEST), 'w') as f:
+                json.dump(names, f)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        size = _entry_size(staging)
+        try:
+            os.rename(staging, os.path.join(self.directory, key))
+        except OSError:
+            # Another process stored the same entry first.
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        if self.max_size is None:
+            return
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += size
+        if self._size > self.max_size:
+            self.evict()
+
+    def _scan_size(self):
+        """Return the total size of the entries.
+        """
+        size = 0
+        for key in os.listdir(self.directory):
+            if key.startswith('.'):
+                continue
+            try:
+                size += _entry_size(os.path.join(self.directory, key))
+            except OSError:
+                pass
+        return size
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits its size.
+        """
+        if self.max_size is None:
+            return
+        entries = []
+        for key in os.listdir(self.directory):
+            if key.startswith('.'):
+                continue
+            entry = os.path.join(self.directory, key)
+            try:
+                entries.append((os.path.getmtime(entry), _entry_size(entry), entry))
+            except OSError:
+                pass
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+        self._size = total_size
@@ -0,0 +1,183 @@
+import argparse
+import glob
+import os
+import sys
+
+
+__all__ = [
+    'main',
+]
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog='vhbb-restyle',
+        description='Restyle the canvases stored in .root files following a transform spec.',
+    )
+    parser.add_argument(
+        'inputs', nargs='+', metavar='INPUT',
+        help='the .root files to restyle, as paths or quoted glob patterns',
+    )
+    parser.add_argument(
+        '-s', '--spec', required=True,
+        help='the .yaml or .json transform spec (see SpecTransform)',
+    )
+    parser.add_argument(
+        '-o', '--output-dir', default=None,
+        help='the directory in which to save the figures (default: next to each input)',
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help='the number of worker processes (default: the number of CPUs)',
+    )
+    parser.add_argument(
+        '-f', '--formats', default='pdf',
+        help='the comma-separated output formats, e.g. pdf,png (default: pdf)',
+    )
+    parser.add_argument(
+        '--suffix', default='_restyled',
+        help='the suffix appended to the name of each input (default: _restyled)',
+    )
+    parser.add_argument(
+        '--pattern', default=None,
+        help='restyle every canvas whose path matches this pattern instead of only the first',
+    )
+    parser.add_argument(
+        '--prefetch', type=int, default=0, metavar='N',
+        help='with --jobs 1 or --packet, read the next N inputs on a background thread (default: 0)',
+    )
+    parser.add_argument(
+        '--background', action='store_true',
+        help='with --jobs 1 or --packet, write the raster formats on a background thread',
+    )
+    parser.add_argument(
+        '--packet', default=None, metavar='PDF',
+        help='also print every figure onto a page of this multi-page PDF, restyling serially',
+    )
+    parser.add_argument(
+        '--no-bookmarks', dest='bookmarks', action='store_false',
+        help='do not bookmark the pages of the packet with the names of the inputs',
+    )
+    parser.add_argument(
+        '--cache', default=None, metavar='DIR',
+        help='skip the inputs whose figures are stored in this output cache',
+    )
+    parser.add_argument(
+        '--daemon', nargs='?', const='', default=None, metavar='SOCKET',
+        help='send the inputs to a running vhbb-restyle-daemon instead of starting ROOT',
+    )
+    parser.add_argument(
+        '-n', '--dry-run', action='store_true',
+        help='check the spec and list the inputs and outputs without restyling',
+    )
+    return parser
+
+
+def _expand(inputs):
+    """Return the paths matched by the inputs in order, each glob pattern expanding to
+    its matches in sorted order, without duplicates.
+    """
+    paths = []
+    seen = set()
+    for entry in inputs:
+        entry = os.path.expanduser(entry)
+        matches = sorted(glob.glob(entry)) if glob.has_magic(entry) else [entry]
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    """Run the vhbb-restyle command and return its exit status, which is 1 if any
+    input could not be restyled.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    # The options which only apply when restyling within this process, and those of them
+    # which only apply to serial runs, i.e. with --jobs 1 or a packet.
+    local = [option for option, value in (
+        ('--jobs', args.jobs is not None),
+        ('--packet', args.packet),
+        ('--cache', args.cache),
+        ('--prefetch', args.prefetch),
+        ('--background', args.background),
+    ) if value]
+    serial = [option for option in local if option in ('--prefetch', '--background')]
+    if args.daemon is not None:
+        if local:
+            parser.error('{} cannot be used with --daemon'.format(', '.join(local)))
+    elif args.dry_run:
+        if local:
+            sys.stderr.write('vhbb-restyle: warning: {} ignored with --dry-run\n'.format(', '.join(local)))
+    elif args.packet is not None:
+        if args.jobs not in (None, 1):
+            parser.error('--jobs cannot be used with --packet, which restyles serially')
+    elif serial and args.jobs != 1:
+        parser.error('{} requires --jobs 1 or --packet'.format(', '.join(serial)))
+    from .batch import run
+    from .transforms import SpecTransform
+    from .transforms.exceptions import SpecError
+
+    paths = _expand(args.inputs)
+    if not paths:
+        sys.stderr.write('vhbb-restyle: no inputs matched\n')
+        return 1
+    formats = tuple(extension.strip().lstrip('.') for extension in args.formats.split(',') if extension.strip())
+    try:
+        transform = SpecTransform.from_file(args.spec)
+    except (IOError, SpecError) as error:
+        parser.error('invalid spec {}: {}'.format(args.spec, error))
+
+    if args.dry_run:
+        for path in paths:
+            name = os.path.splitext(os.path.basename(path) if args.output_dir else path)[0]
+            if args.output_dir:
+                name = os.path.join(args.output_dir, name)
+            if args.pattern is not None:
+                name = '{}_<{}>'.format(name, args.pattern)
+            missing = '' if os.path.isfile(path) else ' (missing)'
+            print('{}{} -> {}'.format(path, missing, ', '.join(
+                '{}{}.{}'.format(name, args.suffix, extension) for extension in formats)))
+        return 0
+
+    if args.output_dir and not os.path.isdir(args.output_dir):
+        os.makedirs(args.output_dir)
+    options = {'output_dir': args.output_dir, 'suffix': args.suffix, 'formats': formats, 'pattern': args.pattern}
+    if args.daemon is not None:
+        from .daemon import DaemonError, render
+        try:
+            responses = render(paths, args.spec, args.daemon or None, **options)
+        except DaemonError as error:
+            sys.stderr.write('vhbb-restyle: {}\n'.format(error))
+            return 1
+        results = [(path, response.get('outputs'), response.get('error')) for path, response in zip(paths, responses)]
+    else:
+        if args.cache is not None:
+            from .cache import OutputCache
+            options['cache'] = OutputCache(args.cache)
+        batch = run(
+            paths,
+            transform,
+            jobs=args.jobs,
+            background=args.background,
+            prefetch=args.prefetch,
+            packet=args.packet,
+            bookmarks=args.bookmarks,
+            **options
+        )
+        results = [result[:3] for result in batch]
+    status = 0
+    for path, outputs, error in results:
+        if error:
+            status = 1
+            sys.stderr.write('{}: failed\n{}'.format(path, error))
+        else:
+            for output in outputs:
+                print(output)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,9 +2,9 @@ import contextlib2
 from rootpy import ROOT
 from rootpy.plotting import Canvas
 
-from .decorations import CMSLabel
-from .decorations import LuminosityLabel
-from .styles import TDRStyle
+from ..instrumentation import stage
+from .decorations import decorate
+from .styles import use_style
 
 
 __all__ = [
@@ -12,6 +12,10 @@ __all__ = [
 ]
 
 
+# The formats written from a single rendering of the canvas into an image.
+RASTER_FORMATS = frozenset(['bmp', 'gif', 'jpg', 'jpeg', 'png', 'tiff', 'xpm'])
+
+
 class CMSCanvas(Canvas):
     """A subclass of Canvas for drawing figures with the CMS Publications Committee style
     documented at https://twiki.cern.ch/twiki/bin/view/CMS/Internal/FigGuidelines.
@@ -87,11 +91,69 @@ class CMSCanvas(Canvas):
         self.SetTicky(0)
         self.margin = (left_margin, right_margin, bottom_margin, top_margin)
 
+    def export(self, basename, formats=('pdf',), pool=None):
+        """Save the canvas in several formats at once.
+
+        The canvas is updated once up front, so that each format is printed without
+        recomputing the pads. The raster formats (see RASTER_FORMATS) are all written
+        from a single image of the canvas, while the vector formats, .C, and .root are
+        saved by ROOT directly.
+
+        Parameters
+        ----------
+        basename : string
+            The path to the output files without the extension.
+
+        formats : iterable of strings, optional
+            The file extensions, which determine the output formats, e.g. 'pdf', 'png',
+            'svg', 'C', or 'root'. The default is ('pdf',).
+
+        pool : multiprocessing.pool.ThreadPool, optional
+            A thread pool on which to write the raster formats in the background. The
+            canvas may be closed straight away, as the image is kept until it is written.
+            The image is only used by the pool and is written without holding the GIL,
+            so the writes overlap with the work of the calling thread. The default is
+            None for writing every format before returning.
+
+        Returns
+        -------
+        outputs : list of strings or AsyncResult
+            The paths to the output files, in the order of the formats. With a pool, an
+            AsyncResult whose get method returns them once the writes are finished.
+        """
+        with stage('update'):
+            self.Modified()
+            self.Update()
+        outputs = ['{}.{}'.format(basename, extension) for extension in formats]
+        raster_outputs = []
+        for output, extension in zip(outputs, formats):
+            if extension.lower() in RASTER_FORMATS:
+                raster_outputs.append(output)
+            else:
+                with stage('save.' + extension):
+                    self.SaveAs(output)
+        if raster_outputs:
+            with stage('image'):
+                image = ROOT.TImage.Create()
+                ROOT.SetOwnership(image, True)
+                image.FromPad(self)
+            if pool is not None:
+                # PyROOT holds the GIL during calls into C++ unless a method is flagged
+                # otherwise. Each export creates its own image, so none is shared.
+                ROOT.ROOT.EnableThreadSafety()
+                type(image).WriteImage._threaded = True
+                return pool.apply_async(_write_image, (image, raster_outputs, outputs))
+            with stage('save.raster'):
+                _write_image(image, raster_outputs, outputs)
+        if pool is not None:
+            return pool.apply_async(list, (outputs,))
+        return outputs
+
     def __enter__(self):
         """Override the __enter__ method to set the TDR style.
         """
         with contextlib2.ExitStack() as stack:
-            stack.enter_context(TDRStyle())
+            stack.enter_context(use_style('tdrStyle'))
             self.close = stack.pop_all().close
         #super(CMSCanvas, self).__enter__()
         return super(CMSCanvas, self).__enter__()
@@ -103,7 +165,9 @@ class CMSCanvas(Canvas):
         self.close()
 
     def decorate(self, lumi_text, cms_position='left', extra_text=''):
-        """Draw the CMS Publications Committee style plot decorations.
+        """Draw the CMS Publications Committee style plot decorations on the current gPad,
+        which need not be this canvas. Use vhbbtools.plotting.decorate to decorate given
+        pads instead.
 
         Parameters
         ----------
@@ -123,11 +187,13 @@ class CMSCanvas(Canvas):
             right of the CMS label outside of the frame. Common examples are 'Preliminary',
             'Simulation', or 'Unpublished'. The default is empty string for no sublabel.
         """
-        cms_label = CMSLabel()
-        cms_label.position = cms_position
-        cms_label.sublabel.text = extra_text
-        cms_label.draw()
-        lumi_label = LuminosityLabel(lumi_text)
-        lumi_label.draw()
+        decorate(ROOT.gPad, lumi_text, cms_position, extra_text)
         ROOT.gPad.Update()
 
+
+def _write_image(image, paths, outputs):
+    """Write an image of a canvas to each path and return the paths to all of the outputs.
+    """
+    for path in paths:
+        image.WriteImage(path)
+    return outputs
@@ -0,0 +1,171 @@
+from collections import namedtuple
+
+from rootpy import ROOT
+
+from .cms_canvas import CMSCanvas
+
+
+__all__ = [
+    'CompositeCanvas',
+    'LAYOUTS',
+    'Panel',
+    'grid_layout',
+]
+
+
+# The row heights of common multi-panel figures, relative to the frame height.
+LAYOUTS = {
+    'ratio': {'rows': (0.7, 0.3)},
+    'ratio_pull': {'rows': (0.6, 0.2, 0.2)},
+}
+
+
+# The position of a pad in the grid, its NDC bounds (x1, y1, x2, y2) on the canvas,
+# its margins (left, right, bottom, top), and the factors by which to scale text
+# sizes and the x and y tick lengths to match their size on the whole canvas.
+Panel = namedtuple('Panel', ['row', 'column', 'bounds', 'margins', 'text_scale', 'tick_scales'])
+
+
+def _cells(weights, start, length, spacing, reverse=False):
+    """Return the (low, high) edges of the frames of a row or column of pads.
+    """
+    total = float(sum(weights))
+    extent = length - spacing * (len(weights) - 1)
+    cells = []
+    edge = start + length if reverse else start
+    for weight in weights:
+        size = extent * weight / total
+        if reverse:
+            cells.append((edge - size, edge))
+            edge -= size + spacing
+        else:
+            cells.append((edge, edge + size))
+            edge += size + spacing
+    return cells
+
+
+def grid_layout(rows, columns, margins, spacing):
+    """Return the panels of a grid of pads whose frames tile the frame of a canvas.
+
+    The outer pads extend to the edges of the canvas with its margins, while adjacent
+    pads meet halfway between their frames, so that the frames are evenly spaced.
+
+    Parameters
+    ----------
+    rows : sequence of floats
+        The relative heights of the rows of frames, from top to bottom.
+
+    columns : sequence of floats
+        The relative widths of the columns of frames, from left to right.
+
+    margins : 4-tuple of floats
+        The left, right, bottom, and top margins of the canvas.
+
+    spacing : float
+        The space between adjacent frames as a fraction of the canvas.
+    """
+    left, right, bottom, top = margins
+    x_cells = _cells(columns, left, 1 - left - right, spacing)
+    y_cells = _cells(rows, bottom, 1 - bottom - top, spacing, reverse=True)
+    panels = []
+    for row, (frame_y1, frame_y2) in enumerate(y_cells):
+        y1 = 0. if row == len(rows) - 1 else frame_y1 - 0.5 * spacing
+        y2 = 1. if row == 0 else frame_y2 + 0.5 * spacing
+        height = y2 - y1
+        for column, (frame_x1, frame_x2) in enumerate(x_cells):
+            x1 = 0. if column == 0 else frame_x1 - 0.5 * spacing
+            x2 = 1. if column == len(columns) - 1 else frame_x2 + 0.5 * spacing
+            width = x2 - x1
+            pad_margins = (
+                (frame_x1 - x1) / width,
+                (x2 - frame_x2) / width,
+                (frame_y1 - y1) / height,
+                (y2 - frame_y2) / height,
+            )
+            panels.append(Panel(row, column, (x1, y1, x2, y2), pad_margins, 1 / height, (1 / height, 1 / width)))
+    return panels
+
+
+class CompositeCanvas(CMSCanvas):
+    """A CMSCanvas divided into a grid of pads, e.g. a plot above its ratio or a matrix
+    of channels, laid out from the relative sizes of their frames.
+
+    The pads are created with their margins set from the canvas margins and spacing.
+    Since text sizes and tick lengths are relative to the size of the pad they are drawn
+    in, scale_text rescales those of a histogram to match the rest of the figure.
+
+    The following attributes are available:
+    * panels : list of Panel
+      The layout of each pad, in row-major order.
+
+    * pads : list of TPad
+      The pads, in row-major order.
+
+    Parameters
+    ----------
+    layout : string, optional
+        The name of a layout in LAYOUTS, e.g. 'ratio', providing the rows and columns.
+        The default is None for passing them explicitly.
+
+    rows : sequence of floats, optional
+        The relative heights of the rows of frames, from top to bottom.
+        The default is (1.,) for a single row.
+
+    columns : sequence of floats, optional
+        The relative widths of the columns of frames, from left to right.
+        The default is (1.,) for a single column.
+
+    spacing : float, optional
+        The space between adjacent frames as a fraction of the canvas.
+        The default is 0.01.
+
+    **kwargs
+        Keyword arguments passed on to CMSCanvas, e.g. the size and outer margins.
+    """
+    def __init__(self, layout=None, rows=(1.,), columns=(1.,), spacing=0.01, **kwargs):
+        super(CompositeCanvas, self).__init__(**kwargs)
+        if layout is not None:
+            rows = LAYOUTS[layout].get('rows', rows)
+            columns = LAYOUTS[layout].get('columns', columns)
+        self.panels = grid_layout(rows, columns, self.margin, spacing)
+        self.pads = []
+        # The pads are attached to the current pad when constructed.
+        self.cd()
+        for panel in self.panels:
+            name = '{}_{:d}_{:d}'.format(self.GetName(), panel.row, panel.column)
+            pad = ROOT.TPad(name, name, *panel.bounds)
+            pad.SetMargin(*panel.margins)
+            pad.SetFillStyle(0)
+            pad.SetBorderMode(0)
+            pad.Draw()
+            self.pads.append(pad)
+        self._shape = (len(rows), len(columns))
+
+    def pad(self, row, column=0):
+        """Return the pad in the given row and column.
+        """
+        return self.pads[row * self._shape[1] + column]
+
+    def panel(self, row, column=0):
+        """Return the layout of the pad in the given row and column.
+        """
+        return self.panels[row * self._shape[1] + column]
+
+    def scale_text(self, obj, row, column=0):
+        """Scale the axis label and title sizes and tick lengths of a histogram, graph,
+        or stack drawn in the given pad by the factors of its panel.
+        """
+        panel = self.panel(row, column)
+        x_scale, y_scale = panel.tick_scales
+        for axis, tick_scale in ((obj.GetXaxis(), x_scale), (obj.GetYaxis(), y_scale)):
+            axis.SetLabelSize(axis.GetLabelSize() * panel.text_scale)
+            axis.SetTitleSize(axis.GetTitleSize() * panel.text_scale)
+            axis.SetTickLength(axis.GetTickLength() * tick_scale)
+
+    def render(self):
+        """Paint every pad in a single update of the canvas.
+        """
+        for pad in self.pads:
+            pad.Modified()
+        self.Modified()
+        self.Update()
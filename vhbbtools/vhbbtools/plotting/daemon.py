@@ -0,0 +1,237 @@
+import argparse
+import errno
+import json
+import os
+import socket
+import sys
+import tempfile
+import traceback
+
+
+__all__ = [
+    'DaemonError',
+    'RenderDaemon',
+    'default_socket',
+    'render',
+    'shutdown',
+]
+
+
+class DaemonError(Exception):
+    pass
+
+
+def default_socket():
+    """Return the path to the socket of the current user's render daemon.
+    """
+    return os.path.join(tempfile.gettempdir(), 'vhbb-restyle-{:d}.sock'.format(os.getuid()))
+
+
+class RenderDaemon(object):
+    """A process keeping ROOT loaded and the TDR style built, which restyles the .root
+    files sent over a local Unix socket, so that a request only costs the restyle itself.
+
+    The requests are JSON objects sent one per line on a connection, each answered by a
+    JSON object on a line of its own. A restyle request holds the path to the .root file,
+    the path to the spec, and optionally the output_dir, suffix, formats, and pattern (see
+    batch.restyle), and is answered with the outputs or the formatted traceback as the
+    error. The request {"command": "shutdown"} stops the daemon.
+
+    The requests are handled one at a time since ROOT's gPad and gStyle are process-global.
+    After each request, the maximum number of digits of the axis labels is restored, as
+    the TDR style is by use_style, so that the style calls of one spec do not leak into
+    the next request. The compiled transforms are kept per spec and recompiled when the spec
+    is modified.
+
+    Parameters
+    ----------
+    path : string, optional
+        The path to the socket. The default is None for default_socket().
+    """
+    def __init__(self, path=None):
+        self.path = path or default_socket()
+        self._transforms = {}
+        self._running = False
+
+    def warm(self):
+        """Load ROOT and everything a restyle needs up front.
+        """
+        from rootpy import ROOT
+        ROOT.gROOT.SetBatch(True)
+        from .cms_canvas import CMSCanvas
+        from .decorations import decoration_pool
+        from .styles import get_style
+        get_style('tdrStyle')
+        decoration_pool()
+        # Rendering a blank canvas once loads the graphics and font libraries.
+        with CMSCanvas() as canvas:
+            canvas.Update()
+        canvas.Close()
+
+    def _transform(self, spec):
+        from .transforms import SpecTransform
+        mtime = os.path.getmtime(spec)
+        try:
+            cached_mtime, transform = self._transforms[spec]
+        except KeyError:
+            pass
+        else:
+            if cached_mtime == mtime:
+                return transform
+        transform = SpecTransform.from_file(spec)
+        self._transforms[spec] = (mtime, transform)
+        return transform
+
+    def handle(self, request):
+        """Return the response to a request.
+        """
+        from rootpy import ROOT
+        from .batch import restyle
+        if request.get('command') == 'shutdown':
+            self._running = False
+            return {'outputs': []}
+        max_digits = ROOT.TGaxis.GetMaxDigits()
+        try:
+            options = dict((key, request[key]) for key in ('output_dir', 'suffix', 'formats', 'pattern') if key in request)
+            outputs = restyle(request['path'], self._transform(request['spec']), **options)
+        except Exception:
+            return {'error': traceback.format_exc()}
+        finally:
+            ROOT.TGaxis.SetMaxDigits(max_digits)
+        return {'outputs': outputs}
+
+    def _bind(self):
+        if os.path.exists(self.path):
+            # Remove the socket of a daemon which did not shut down cleanly, unless it is
+            # still being served.
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except socket.error:
+                os.unlink(self.path)
+            else:
+                raise DaemonError('A daemon is already serving {}'.format(self.path))
+            finally:
+                probe.close()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.path)
+        os.chmod(self.path, 0o600)
+        server.listen(8)
+        return server
+
+    def serve(self):
+        """Warm up and serve requests until shut down.
+        """
+        self.warm()
+        server = self._bind()
+        self._running = True
+        try:
+            while self._running:
+                connection, _ = server.accept()
+                try:
+                    stream = connection.makefile('rw')
+                    for line in stream:
+                        if not line.strip():
+                            continue
+                        try:
+                            response = self.handle(json.loads(line))
+                        except ValueError:
+                            response = {'error': 'Malformed request: {!r}'.format(line)}
+                        stream.write(json.dumps(response) + '\n')
+                        stream.flush()
+                        if not self._running:
+                            break
+                    stream.close()
+                except socket.error as error:
+                    if error.errno != errno.EPIPE:
+                        raise
+                finally:
+                    connection.close()
+        finally:
+            server.close()
+            os.unlink(self.path)
+
+
+def _request(requests, socket_path):
+    """Send requests to the daemon over a single connection and return the responses.
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path or default_socket())
+    except socket.error as error:
+        client.close()
+        raise DaemonError('No daemon is serving {}: {}'.format(socket_path or default_socket(), error))
+    try:
+        stream = client.makefile('rw')
+        responses = []
+        for request in requests:
+            stream.write(json.dumps(request) + '\n')
+            stream.flush()
+            line = stream.readline()
+            if not line:
+                raise DaemonError('The daemon closed the connection.')
+            responses.append(json.loads(line))
+        stream.close()
+        return responses
+    finally:
+        client.close()
+
+
+def render(paths, spec, socket_path=None, **options):
+    """Restyle .root files on the render daemon.
+
+    Parameters
+    ----------
+    paths : string or iterable of strings
+        The paths to the .root files, resolved against the current directory.
+
+    spec : string
+        The path to the transform spec.
+
+    socket_path : string, optional
+        The path to the socket. The default is None for default_socket().
+
+    **options
+        The output_dir, suffix, formats, and pattern passed on to batch.restyle.
+
+    Returns
+    -------
+    responses : list of dicts
+        The response for each file, holding either its outputs or the error.
+    """
+    if isinstance(paths, basestring):
+        paths = [paths]
+    if options.get('output_dir') is not None:
+        options['output_dir'] = os.path.abspath(options['output_dir'])
+    if 'formats' in options:
+        options['formats'] = list(options['formats'])
+    spec = os.path.abspath(spec)
+    requests = [dict(options, path=os.path.abspath(path), spec=spec) for path in paths]
+    return _request(requests, socket_path)
+
+
+def shutdown(socket_path=None):
+    """Stop the render daemon.
+    """
+    _request([{'command': 'shutdown'}], socket_path)
+
+
+def main(argv=None):
+    """Run the vhbb-restyle-daemon command.
+    """
+    parser = argparse.ArgumentParser(
+        prog='vhbb-restyle-daemon',
+        description='Serve restyle requests from a process keeping ROOT loaded.',
+    )
+    parser.add_argument('--socket', default=None, help='the path to the socket (default: {})'.format(default_socket()))
+    parser.add_argument('--stop', action='store_true', help='stop the daemon serving the socket')
+    args = parser.parse_args(argv)
+    try:
+        if args.stop:
+            shutdown(args.socket)
+        else:
+            RenderDaemon(args.socket).serve()
+    except DaemonError as error:
+        sys.stderr.write('vhbb-restyle-daemon: {}\n'.format(error))
+        return 1
+    return 0
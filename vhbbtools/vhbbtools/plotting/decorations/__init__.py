@@ -1,2 +1,13 @@
-from .cms_label import CMSLabel
-from .luminosity_label import LuminosityLabel
+from ...lazy import lazy_import
+
+
+lazy_import(__name__, {
+    'CMS_lumi': '.legacy',
+    'CMSLabel': '.cms_label',
+    'DecorationPool': '.pool',
+    'LuminosityLabel': '.luminosity_label',
+    'cms_label_layout': '.layout',
+    'decorate': '.pool',
+    'decoration_pool': '.pool',
+    'luminosity_label_layout': '.layout',
+})
@@ -1,7 +1,7 @@
 from rootpy import ROOT
 
 from .bases import BaseLabel
-from .exceptions import PositionError
+from .layout import cms_label_layout
 
 
 __all__ = [
@@ -83,87 +83,23 @@ class CMSLabel(BaseLabel):
         self.sublabel.padding_left = 0.12
         self.sublabel.padding_top = 1.2
 
-    def _draw_label_left(self):
-        """Draw the label on the top left corner inside the frame and return its coordinates.
+    def layout(self, margins, position=None):
+        """Return the layout of the label and sublabel on pads with the given margins.
+        The position defaults to the position attribute of the label.
         """
-        left_margin, right_margin, bottom_margin, top_margin = ROOT.gPad.margin
-        self.size = self.scale * top_margin
-        self.align = ('left', 'top')
-        x = left_margin + self.padding_left * (1 - left_margin - right_margin)
-        y = 1 - top_margin - (self.padding_top or 0.035) * (1 - top_margin - bottom_margin)
-        self.DrawLatexNDC(x, y, self.text)
-        return x, y
-
-    def _draw_label_center(self):
-        """Draw the label on the top center inside the frame and return its coordinates.
-        """
-        left_margin, right_margin, bottom_margin, top_margin = ROOT.gPad.margin
-        self.size = self.scale * top_margin
-        self.align = ('center', 'top')
-        x = left_margin + 0.5 * (1 - left_margin - right_margin)
-        y = 1 - top_margin - (self.padding_top or 0.035) * (1 - top_margin - bottom_margin)
-        self.DrawLatexNDC(x, y, self.text)
-        return x, y
-
-    def _draw_label_right(self):
-        """Draw the label on the top right corner inside the frame and return its coordinates.
-        """
-        left_margin, right_margin, bottom_margin, top_margin = ROOT.gPad.margin
-        self.size = self.scale * top_margin
-        self.align = ('right', 'top')
-        x = 1 - right_margin - self.padding_right * (1 - left_margin - right_margin)
-        y = 1 - top_margin - (self.padding_top or 0.035) * (1 - top_margin - bottom_margin)
-        self.DrawLatexNDC(x, y, self.text)
-        return x, y
-
-    def _draw_label_outside(self):
-        """Draw the label on the top left corner outside the frame and return its coordinates.
-        """
-        left_margin, _, _, top_margin = ROOT.gPad.margin
-        self.size = self.scale * top_margin
-        self.align = ('left', 'bottom')
-        x = left_margin
-        y = 1 - (self.padding_top or 0.8) * top_margin
-        self.DrawLatexNDC(x, y, self.text)
-        return x, y
-
-    def _draw_sublabel_inside(self, x_label, y_label):
-        """Draw the sublabel below the label inside the frame.
-        """
-        self.sublabel.size = self.sublabel.scale * self.size
-        self.sublabel.align = self.align
-        x_sublabel = x_label
-        y_sublabel = y_label - self.sublabel.padding_top * self.size
-        self.sublabel.DrawLatexNDC(x_sublabel, y_sublabel, self.sublabel.text)
-
-    def _draw_sublabel_outside(self, x_label, y_label):
-        """Draw the sublabel to the right of the label outside the frame.
-        """
-        left_margin, right_margin, _, _ = ROOT.gPad.margin
-        self.sublabel.size = self.sublabel.scale * self.size
-        self.sublabel.align = self.align
-        x_sublabel = left_margin + self.sublabel.padding_left * (1 - left_margin - right_margin)
-        y_sublabel = y_label
-        self.sublabel.DrawLatexNDC(x_sublabel, y_sublabel, self.sublabel.text)
+        return cms_label_layout(
+            margins,
+            position or self.position,
+            self.scale,
+            (self.padding_left, self.padding_right, self.padding_top),
+            self.sublabel.scale,
+            (self.sublabel.padding_left, self.sublabel.padding_top),
+        )
 
     def draw(self):
         """Draw the CMS label and sublabel on the active canvas.
         """
-        # Draw the label.
-        if self.position == 'left':
-            label_coordinates = self._draw_label_left()
-        elif self.position == 'center':
-            label_coordinates = self._draw_label_center()
-        elif self.position == 'right':
-            label_coordinates = self._draw_label_right()
-        elif self.position == 'outside':
-            label_coordinates = self._draw_label_outside()
-        else:
-            raise PositionError('Unrecognized value: {}'.format(self.position))
-        # Draw the sublabel.
+        label_layout, sublabel_layout = self.layout(ROOT.gPad.margin)
+        label_layout.draw(self, self.text)
         if self.sublabel.text:
-            if self.position == 'outside':
-                self._draw_sublabel_outside(*label_coordinates)
-            else:
-                self._draw_sublabel_inside(*label_coordinates)
-
+            sublabel_layout.draw(self.sublabel, self.sublabel.text)
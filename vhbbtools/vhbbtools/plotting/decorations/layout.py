@@ -0,0 +1,148 @@
+from collections import namedtuple
+
+from .exceptions import PositionError
+
+
+__all__ = [
+    'CMSLabelLayout',
+    'TextLayout',
+    'cms_label_layout',
+    'luminosity_label_layout',
+]
+
+
+# The layouts computed so far, keyed by the arguments of the functions computing them.
+_CMS_LABEL_LAYOUTS = {}
+_LUMINOSITY_LABEL_LAYOUTS = {}
+
+
+class TextLayout(namedtuple('TextLayout', ['x', 'y', 'size', 'align'])):
+    """The NDC coordinates, text size, and ROOT text alignment code of a text, which
+    can be replayed on any number of pads sharing the margins it was computed for.
+    """
+    __slots__ = ()
+
+    def draw(self, latex, text):
+        """Draw the text with a TLatex on the active pad.
+        """
+        latex.SetTextSize(self.size)
+        latex.SetTextAlign(self.align)
+        latex.DrawLatexNDC(self.x, self.y, text)
+
+
+# The layouts of the CMS label and its sublabel.
+CMSLabelLayout = namedtuple('CMSLabelLayout', ['label', 'sublabel'])
+
+
+def _label_left(margins, scale, padding):
+    left_margin, right_margin, bottom_margin, top_margin = margins
+    padding_left, _, padding_top = padding
+    x = left_margin + padding_left * (1 - left_margin - right_margin)
+    y = 1 - top_margin - (padding_top or 0.035) * (1 - top_margin - bottom_margin)
+    return TextLayout(x, y, scale * top_margin, 13)
+
+
+def _label_center(margins, scale, padding):
+    left_margin, right_margin, bottom_margin, top_margin = margins
+    _, _, padding_top = padding
+    x = left_margin + 0.5 * (1 - left_margin - right_margin)
+    y = 1 - top_margin - (padding_top or 0.035) * (1 - top_margin - bottom_margin)
+    return TextLayout(x, y, scale * top_margin, 23)
+
+
+def _label_right(margins, scale, padding):
+    left_margin, right_margin, bottom_margin, top_margin = margins
+    _, padding_right, padding_top = padding
+    x = 1 - right_margin - padding_right * (1 - left_margin - right_margin)
+    y = 1 - top_margin - (padding_top or 0.035) * (1 - top_margin - bottom_margin)
+    return TextLayout(x, y, scale * top_margin, 33)
+
+
+def _label_outside(margins, scale, padding):
+    left_margin, _, _, top_margin = margins
+    _, _, padding_top = padding
+    x = left_margin
+    y = 1 - (padding_top or 0.8) * top_margin
+    return TextLayout(x, y, scale * top_margin, 11)
+
+
+def _sublabel_inside(margins, label, scale, padding):
+    _, padding_top = padding
+    return TextLayout(label.x, label.y - padding_top * label.size, scale * label.size, label.align)
+
+
+def _sublabel_outside(margins, label, scale, padding):
+    left_margin, right_margin, _, _ = margins
+    padding_left, _ = padding
+    x = left_margin + padding_left * (1 - left_margin - right_margin)
+    return TextLayout(x, label.y, scale * label.size, label.align)
+
+
+# The functions computing the label and sublabel layouts, keyed by the label position.
+_POSITIONS = {
+    'left': (_label_left, _sublabel_inside),
+    'center': (_label_center, _sublabel_inside),
+    'right': (_label_right, _sublabel_inside),
+    'outside': (_label_outside, _sublabel_outside),
+}
+
+
+def cms_label_layout(
+    margins,
+    position='left',
+    scale=0.75,
+    padding=(0.045, 0.045, None),
+    sublabel_scale=0.76,
+    sublabel_padding=(0.12, 1.2),
+):
+    """Return the layout of the CMS label and its sublabel on pads with the given margins.
+    Each layout is only computed once. See CMSLabel for the meaning of the arguments.
+
+    Parameters
+    ----------
+    margins : 4-tuple of floats
+        The left, right, bottom, and top margins of the pads.
+
+    position : string, optional
+        The label position, one of 'left', 'center', 'right', or 'outside'.
+
+    scale : float, optional
+        The label text size scale.
+
+    padding : 3-tuple of floats, optional
+        The left, right, and top padding of the label. A top padding of None stands
+        for the default of the position.
+
+    sublabel_scale : float, optional
+        The sublabel text size scale.
+
+    sublabel_padding : 2-tuple of floats, optional
+        The left and top padding of the sublabel.
+    """
+    key = (tuple(margins), position, scale, tuple(padding), sublabel_scale, tuple(sublabel_padding))
+    try:
+        return _CMS_LABEL_LAYOUTS[key]
+    except KeyError:
+        pass
+    try:
+        label_layout, sublabel_layout = _POSITIONS[position]
+    except KeyError:
+        raise PositionError('Unrecognized value: {}'.format(position))
+    label = label_layout(key[0], scale, key[3])
+    sublabel = sublabel_layout(key[0], label, sublabel_scale, key[5])
+    _CMS_LABEL_LAYOUTS[key] = CMSLabelLayout(label, sublabel)
+    return _CMS_LABEL_LAYOUTS[key]
+
+
+def luminosity_label_layout(margins, scale=0.6, padding_top=0.8, align=31):
+    """Return the layout of the luminosity label on pads with the given margins. Each
+    layout is only computed once. See LuminosityLabel for the meaning of the arguments.
+    """
+    key = (tuple(margins), scale, padding_top, align)
+    try:
+        return _LUMINOSITY_LABEL_LAYOUTS[key]
+    except KeyError:
+        pass
+    _, right_margin, _, top_margin = key[0]
+    _LUMINOSITY_LABEL_LAYOUTS[key] = TextLayout(1 - right_margin, 1 - padding_top * top_margin, scale * top_margin, align)
+    return _LUMINOSITY_LABEL_LAYOUTS[key]
@@ -0,0 +1,116 @@
+from .exceptions import PositionError
+from .pool import decorate
+
+
+__all__ = [
+    'CMS_lumi',
+    'legacy_lumi_text',
+    'legacy_position',
+]
+
+
+# The module-level settings of the legacy CMS_lumi.py, which macros modify before calling
+# CMS_lumi, e.g. CMS_lumi.lumi_13TeV = '35.9 fb^{-1}'. They are read on every call.
+lumi_13TeV = '20.1 fb^{-1}'
+lumi_8TeV = '19.7 fb^{-1}'
+lumi_7TeV = '5.1 fb^{-1}'
+lumi_sqrtS = ''
+writeExtraText = True
+extraText = 'Preliminary'
+
+# The data taking periods of each legacy iPeriod code, latest first. Code 12 is the
+# bare centre-of-mass energy and code 0 is lumi_sqrtS.
+PERIODS = {
+    1: ('7TeV',),
+    2: ('8TeV',),
+    3: ('8TeV', '7TeV'),
+    4: ('13TeV',),
+    7: ('13TeV', '8TeV', '7TeV'),
+}
+
+# The luminosity label texts assembled so far, keyed by the arguments of legacy_lumi_text.
+_LUMI_TEXTS = {}
+
+
+def legacy_lumi_text(period, out_of_frame=False, lumis=None):
+    """Return the luminosity label text of a legacy iPeriod code, assembled once per
+    combination of the code and luminosities.
+
+    Parameters
+    ----------
+    period : int
+        The legacy iPeriod code.
+
+    out_of_frame : bool, optional
+        Whether the CMS label is outside the frame, which shrinks the text of the three
+        periods of code 7 to fit next to it. The default is False.
+
+    lumis : dict, optional
+        The integrated luminosity text keyed by the period, e.g. '13TeV', along with the
+        text of code 0 keyed by 'sqrtS'. The default is None for the module settings.
+    """
+    if lumis is None:
+        lumis = {'13TeV': lumi_13TeV, '8TeV': lumi_8TeV, '7TeV': lumi_7TeV, 'sqrtS': lumi_sqrtS}
+    key = (period, out_of_frame and period == 7, tuple(sorted(lumis.items())))
+    try:
+        return _LUMI_TEXTS[key]
+    except KeyError:
+        pass
+    if period == 0:
+        text = lumis['sqrtS']
+    elif period == 12:
+        text = '8 TeV'
+    elif period in PERIODS:
+        text = ' + '.join(
+            '{} ({} TeV)'.format(lumis[energy], energy[:-3]) for energy in PERIODS[period]
+        )
+        if key[1]:
+            text = '#scale[0.85]{' + text + '}'
+    else:
+        text = ''
+    _LUMI_TEXTS[key] = text
+    return text
+
+
+def legacy_position(iPosX):
+    """Return the CMS label position of a legacy iPosX code, which is 0 for outside the
+    frame and otherwise 11, 22, or 33 for the left, center, or right inside the frame.
+    """
+    if iPosX // 10 == 0:
+        return 'outside'
+    column = iPosX % 10
+    if column <= 1:
+        return 'left'
+    if column == 2:
+        return 'center'
+    if column == 3:
+        return 'right'
+    raise PositionError('Unrecognized iPosX: {!r}'.format(iPosX))
+
+
+def CMS_lumi(pad, iPeriod, iPosX):
+    """A drop-in replacement for CMS_lumi from the legacy CMS_lumi.py, so that existing
+    macros draw their decorations through the decoration pool by changing an import:
+
+        from vhbbtools.plotting.decorations import legacy as CMS_lumi
+
+    The legacy settings are the attributes of this module, and the iPeriod and iPosX codes
+    are mapped onto the luminosity label text and CMS label position (see legacy_lumi_text
+    and legacy_position). The CMS logo is not supported, and the labels keep the style of
+    the decoration pool rather than the legacy text sizes and offsets.
+
+    Parameters
+    ----------
+    pad : TPad
+        The pad to decorate.
+
+    iPeriod : int
+        The legacy code of the data taking periods.
+
+    iPosX : int
+        The legacy code of the CMS label position.
+    """
+    position = legacy_position(iPosX)
+    lumi_text = legacy_lumi_text(iPeriod, position == 'outside')
+    decorate(pad, lumi_text, position, extraText if writeExtraText else '')
+    pad.Update()
@@ -1,6 +1,7 @@
 from rootpy import ROOT
 
 from .bases import BaseLabel
+from .layout import luminosity_label_layout
 
 
 __all__ = [
@@ -44,12 +45,13 @@ class LuminosityLabel(BaseLabel):
         self.align = ('right', 'bottom')
         self.padding_top = 0.8
 
+    def layout(self, margins):
+        """Return the layout of the label on pads with the given margins.
+        """
+        return luminosity_label_layout(margins, self.scale, self.padding_top, self.align)
+
     def draw(self):
         """Draw the luminosity label on the active canvas.
         """
-        _, right_margin, _, top_margin = ROOT.gPad.margin
-        self.size = self.scale * top_margin
-        x = 1 - right_margin
-        y = 1 - self.padding_top * top_margin
-        self.DrawLatexNDC(x, y, self.text)
+        self.layout(ROOT.gPad.margin).draw(self, self.text)
 
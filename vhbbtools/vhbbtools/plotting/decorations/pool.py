@@ -0,0 +1,127 @@
+from rootpy import ROOT
+
+from ...instrumentation import stage
+from .cms_label import CMSLabel
+from .luminosity_label import LuminosityLabel
+
+
+__all__ = [
+    'DecorationPool',
+    'decorate',
+    'decoration_pool',
+]
+
+
+# The name of the primitive holding the decorations of a pad.
+PAVE_NAME = 'cms_decorations'
+
+# The pool shared by every CMSCanvas, created on first use.
+_DEFAULT_POOL = None
+
+
+class DecorationPool(object):
+    """A CMS label and luminosity label reused for decorating any number of pads.
+
+    The labels only hold the style attributes (see CMSLabel and LuminosityLabel), which
+    may be modified through the cms_label and luminosity_label attributes. Their texts
+    are drawn as the lines of a single transparent TPaveText spanning the pad, which
+    is owned by the pad and cleared rather than replaced when the pad is decorated
+    again, so decorating allocates a fixed number of objects per pad.
+
+    The following attributes are available:
+    * cms_label : CMSLabel
+      The CMS label. Its position and sublabel text are taken from decorate instead.
+
+    * luminosity_label : LuminosityLabel
+      The luminosity label. Its text is taken from decorate instead.
+
+    Decorating neither modifies the labels nor switches gPad, so pads of different
+    canvases may be decorated concurrently as long as the labels are left alone.
+    """
+    def __init__(self):
+        self.cms_label = CMSLabel()
+        self.luminosity_label = LuminosityLabel('')
+
+    @staticmethod
+    def _get_pave(pad):
+        """Return the empty TPaveText holding the decorations of a pad, adding it to the
+        primitives of the pad if the pad has not been decorated before.
+        """
+        pave = pad.GetListOfPrimitives().FindObject(PAVE_NAME)
+        if pave:
+            pave.Clear()
+            return pave
+        pave = ROOT.TPaveText(0, 0, 1, 1, 'NDC NB')
+        pave.SetName(PAVE_NAME)
+        pave.SetFillStyle(0)
+        pave.SetBorderSize(0)
+        # Hand the pave over to the pad, which deletes it along with its other primitives.
+        pave.SetBit(ROOT.kCanDelete)
+        ROOT.SetOwnership(pave, False)
+        pad.GetListOfPrimitives().Add(pave)
+        return pave
+
+    @staticmethod
+    def _add_text(pave, layout, text, font):
+        """Add a text to the pave. Since the pave spans the pad, the coordinates of the
+        layout relative to the pave are its NDC coordinates on the pad.
+        """
+        line = pave.AddText(layout.x, layout.y, text)
+        line.SetTextSize(layout.size)
+        line.SetTextAlign(layout.align)
+        line.SetTextFont(font)
+
+    def decorate(self, pad, lumi_text, cms_position='left', extra_text=''):
+        """Draw the CMS Publications Committee style plot decorations on a pad. See
+        CMSCanvas.decorate for the meaning of the arguments.
+        """
+        margins = (pad.GetLeftMargin(), pad.GetRightMargin(), pad.GetBottomMargin(), pad.GetTopMargin())
+        label_layout, sublabel_layout = self.cms_label.layout(margins, cms_position)
+        pave = self._get_pave(pad)
+        self._add_text(pave, label_layout, self.cms_label.text, self.cms_label.font)
+        if extra_text:
+            self._add_text(pave, sublabel_layout, extra_text, self.cms_label.sublabel.font)
+        lumi_label = self.luminosity_label
+        lumi_layout = lumi_label.layout(margins)
+        self._add_text(pave, lumi_layout, lumi_text, lumi_label.font)
+        pad.Modified()
+
+
+def decoration_pool():
+    """Return the decoration pool shared by every CMSCanvas.
+    """
+    global _DEFAULT_POOL
+    if _DEFAULT_POOL is None:
+        _DEFAULT_POOL = DecorationPool()
+    return _DEFAULT_POOL
+
+
+def decorate(pads, lumi_text, cms_position='left', extra_text='', pool=None):
+    """Draw the CMS Publications Committee style plot decorations on one or more pads,
+    e.g. every pad of a grid of channels, without switching gPad.
+
+    Parameters
+    ----------
+    pads : TPad or iterable of TPad
+        The pads to decorate.
+
+    lumi_text : string
+        The luminosity label text (see CMSCanvas.decorate).
+
+    cms_position : string, optional
+        The CMS label position on each pad (see CMSCanvas.decorate).
+
+    extra_text : string, optional
+        The sublabel text (see CMSCanvas.decorate).
+
+    pool : DecorationPool, optional
+        The pool whose labels style the decorations. The default is None for the pool
+        shared by every CMSCanvas.
+    """
+    if isinstance(pads, ROOT.TVirtualPad):
+        pads = [pads]
+    if pool is None:
+        pool = decoration_pool()
+    with stage('decorate'):
+        for pad in pads:
+            pool.decorate(pad, lumi_text, cms_position, extra_text)
@@ -0,0 +1,63 @@
+from rootpy import ROOT
+
+
+__all__ = [
+    'PDFPacket',
+]
+
+
+class PDFPacket(object):
+    """A multi-page PDF into which canvases are printed one page at a time, e.g. the
+    figures of a batch collected into a review packet.
+
+    The file is opened by the first page and closed once, so ROOT's PDF writer and the
+    embedded fonts are shared by every page instead of being repeated in a standalone
+    PDF per figure. Use it as a context manager, or call close once every page is added.
+
+    Parameters
+    ----------
+    path : string
+        The path to the .pdf file.
+
+    bookmarks : bool, optional
+        Whether to add a bookmark with the title of each page to the outline of the PDF.
+        The default is True.
+    """
+    def __init__(self, path, bookmarks=True):
+        if not path.lower().endswith('.pdf'):
+            raise ValueError('A PDF packet must be saved to a .pdf file, got: {}'.format(path))
+        self.path = path
+        self.bookmarks = bookmarks
+        self.pages = 0
+        self._open = False
+
+    def add(self, canvas, title=None):
+        """Print a canvas onto a new page, bookmarked with the given title if any.
+        """
+        if not self._open:
+            canvas.Print(self.path + '[')
+            self._open = True
+        if self.bookmarks and title:
+            canvas.Print(self.path, 'Title:' + title)
+        else:
+            canvas.Print(self.path)
+        self.pages += 1
+
+    def close(self):
+        """Close the file. The canvases of the pages may already be closed, so a blank
+        canvas closes it instead. Nothing is written if no page was added.
+        """
+        if not self._open:
+            return
+        canvas = ROOT.TCanvas('pdf_packet_close', '', 1, 1)
+        try:
+            canvas.Print(self.path + ']')
+        finally:
+            canvas.Close()
+        self._open = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
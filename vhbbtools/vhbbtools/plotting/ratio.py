@@ -0,0 +1,156 @@
+import numpy as np
+from rootpy import ROOT
+
+from .. import stats
+
+
+__all__ = [
+    'fill_ratio_pad',
+    'ratio_histogram',
+    'uncertainty_band',
+]
+
+
+def _total(mc):
+    """Return the histogram of the total MC, which for a THStack is the sum of its histograms.
+    """
+    if mc.InheritsFrom('THStack'):
+        return mc.GetStack().Last()
+    return mc
+
+
+def _new_histogram(template, name, contents, variances):
+    """Return an empty copy of a histogram with the given contents and variances in the
+    bins within the range of its x-axis. The copy is owned by the pad it is drawn on.
+    """
+    hist = template.Clone(name)
+    hist.SetDirectory(0)
+    hist.Reset()
+    if not hist.GetSumw2N():
+        hist.Sumw2()
+    x_axis = hist.GetXaxis()
+    bins = slice(x_axis.GetFirst(), x_axis.GetLast() + 1)
+    stats.bin_contents(hist, overflow=True)[bins] = contents
+    stats.bin_variances(hist, overflow=True)[bins] = variances
+    hist.SetBit(ROOT.kCanDelete)
+    ROOT.SetOwnership(hist, False)
+    return hist
+
+
+def ratio_histogram(data, mc, name='ratio'):
+    """Return the histogram of the ratio of the data to the MC, with the error of the data.
+    Bins with empty MC are empty. It is a copy of the data histogram, so it keeps its style.
+
+    Parameters
+    ----------
+    data : TH1
+        The data histogram.
+
+    mc : TH1 or THStack
+        The MC histogram or stack.
+
+    name : string, optional
+        The name of the histogram. The default is 'ratio'.
+    """
+    values, errors = stats.ratio(data, mc)
+    return _new_histogram(data, name, values, errors ** 2)
+
+
+def uncertainty_band(mc, syst=None, name='uncertainty'):
+    """Return the histogram of the relative uncertainty of the MC centred on one, to be
+    drawn as a band with the option 'E2'. Bins with empty MC have no uncertainty.
+
+    Parameters
+    ----------
+    mc : TH1 or THStack
+        The MC histogram or stack, whose bin errors are the statistical uncertainty.
+
+    syst : float or array of floats, optional
+        The relative systematic uncertainty of all bins or of each bin within the range
+        of the x-axis, added in quadrature. The default is None for only the statistical
+        uncertainty.
+
+    name : string, optional
+        The name of the histogram. The default is 'uncertainty'.
+    """
+    batch = stats.HistogramBatch([mc])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relative_variances = np.where(batch.contents != 0, batch.variances / batch.contents ** 2, 0.)
+    if syst is not None:
+        relative_variances = relative_variances + np.where(batch.contents != 0, np.square(syst), 0.)
+    band = _new_histogram(_total(mc), name, np.ones_like(batch.contents), relative_variances)
+    band.SetMarkerSize(0)
+    band.SetFillStyle(3013)
+    band.SetFillColor(ROOT.kGray + 2)
+    band.SetLineColor(ROOT.kGray + 2)
+    return band
+
+
+def fill_ratio_pad(pad, data, mc, syst=None):
+    """Fill a pad with the ratio of the data to the MC and its uncertainty bands, laid
+    out like the lower pads of the ratio plots, so that the transforms of those pads
+    apply to it. Nothing is drawn through gPad.
+
+    The primitives are, in drawing order, the frame, the ratio named 'ratio', the band
+    of the statistical and systematic uncertainty named 'uncertainty_syst' if syst is
+    given, the band of the statistical uncertainty named 'uncertainty_stat', a copy of
+    the ratio named 'ratio_copy' drawn on top of the bands, and the legend of the bands.
+    This is the layout of the lower pads of PASFigure3 and PASFigure4 with syst and of
+    ZllH without. The lower pads of the other figures are laid out differently, so
+    their transforms select other primitives than those of a filled pad.
+
+    Parameters
+    ----------
+    pad : TPad
+        The pad, which should be empty.
+
+    data : TH1
+        The data histogram.
+
+    mc : TH1 or THStack
+        The MC histogram or stack.
+
+    syst : float or array of floats, optional
+        The relative systematic uncertainty (see uncertainty_band). The default is None
+        for no systematic uncertainty band.
+
+    Returns
+    -------
+    primitives : list of TH1 and TLegend
+        The histograms and the legend added to the pad, in drawing order.
+    """
+    primitives = pad.GetListOfPrimitives()
+    primitives.AddFirst(pad.GetFrame())
+    ratio = ratio_histogram(data, mc)
+    ratio.SetMinimum(0)
+    ratio.SetMaximum(1.999)
+    ratio.GetYaxis().SetTitle('Data / MC')
+    histograms = [(ratio, 'PE')]
+    legend = ROOT.TLegend(0.32, 0.86, 0.93, 0.97)
+    legend.SetLineWidth(2)
+    legend.SetBorderSize(0)
+    legend.SetFillColor(0)
+    legend.SetFillStyle(4000)
+    legend.SetTextSize(0.075)
+    legend.SetNColumns(2)
+    legend.SetBit(ROOT.kCanDelete)
+    ROOT.SetOwnership(legend, False)
+    if syst is not None:
+        syst_band = uncertainty_band(mc, syst, 'uncertainty_syst')
+        syst_band.SetFillStyle(1001)
+        syst_band.SetFillColor(ROOT.kAzure - 9)
+        syst_band.SetLineColor(ROOT.kAzure - 9)
+        histograms.append((syst_band, 'E2 SAME'))
+        legend.AddEntry(syst_band, 'MC Unc. (Stat. + Syst.)', 'f')
+    stat_band = uncertainty_band(mc, name='uncertainty_stat')
+    histograms.append((stat_band, 'E2 SAME'))
+    legend.AddEntry(stat_band, 'MC Unc. (Stat.)', 'f')
+    ratio_copy = ratio.Clone('ratio_copy')
+    ratio_copy.SetBit(ROOT.kCanDelete)
+    ROOT.SetOwnership(ratio_copy, False)
+    histograms.append((ratio_copy, 'PE SAME'))
+    for hist, option in histograms:
+        primitives.Add(hist, option)
+    primitives.Add(legend, 'SAME')
+    pad.Modified()
+    return [hist for hist, _ in histograms] + [legend]
@@ -0,0 +1,185 @@
+import multiprocessing
+import os
+import shutil
+import traceback
+from collections import namedtuple
+
+import numpy as np
+
+
+__all__ = [
+    'Comparison',
+    'Figure',
+    'check',
+    'compare_images',
+    'read_image',
+    'render_spec',
+]
+
+
+# A figure to check, rendered to the .png at the path passed as the first argument
+# of the render function followed by args. The name is the path of its golden image
+# within the golden directory, without the extension, e.g. 'ZllH/Zll_pTBalance'.
+Figure = namedtuple('Figure', ['name', 'render', 'args'])
+
+# The outcome of checking a figure against its golden image. The fraction is that of
+# the pixels differing by more than the tolerance and the max_difference is the largest
+# difference of any channel of any pixel, both None if the images could not be compared
+# because they differ in size or an error occurred, the latter holding the traceback
+# or, if the golden image is missing, a message saying so.
+Comparison = namedtuple(
+    'Comparison',
+    ['name', 'output', 'golden', 'passed', 'fraction', 'max_difference', 'error'],
+)
+
+
+def read_image(path):
+    """Return an image as a NumPy array of shape (height, width, 4) holding the red,
+    green, blue, and alpha channels of each pixel as unsigned 8-bit integers.
+
+    The image is read by ROOT's TImage, so every format written by CMSCanvas.export is
+    supported, and the packed ARGB pixels are unpacked without looping over them.
+    """
+    from rootpy import ROOT
+    if not os.path.isfile(path):
+        raise IOError('No such image: {}'.format(path))
+    image = ROOT.TImage.Open(path)
+    if not image or not image.IsValid():
+        raise IOError('Unable to read the image: {}'.format(path))
+    ROOT.SetOwnership(image, True)
+    width, height = image.GetWidth(), image.GetHeight()
+    buf = image.GetArgbArray()
+    buf.SetSize(width * height)
+    argb = np.frombuffer(buf, dtype=np.uint32, count=width * height).reshape(height, width)
+    shifts = np.array([16, 8, 0, 24], dtype=np.uint32)
+    return ((argb[..., np.newaxis] >> shifts) & 0xFF).astype(np.uint8)
+
+
+def compare_images(output, golden, tolerance=2, threshold=1e-4):
+    """Compare two images pixel by pixel.
+
+    A pixel differs if any of its channels differs by more than the tolerance, which
+    absorbs the jitter of anti-aliasing between ROOT builds. The images match if the
+    fraction of differing pixels is at most the threshold, below which a change is not
+    visible at the size a figure is viewed.
+
+    Parameters
+    ----------
+    output : array of uint8
+        The rendered image (see read_image).
+
+    golden : array of uint8
+        The golden image.
+
+    tolerance : int, optional
+        The largest difference of a channel, out of 255, for which a pixel is still the
+        same. The default is 2.
+
+    threshold : float, optional
+        The largest fraction of the pixels which may differ. The default is 1e-4, or
+        about 50 pixels of an 800 x 600 figure.
+
+    Returns
+    -------
+    passed, fraction, max_difference : bool, float, int
+        Whether the images match, the fraction of differing pixels, and the largest
+        difference of any channel. If the images differ in size, they do not match and
+        the fraction and largest difference are None.
+    """
+    if output.shape != golden.shape:
+        return False, None, None
+    difference = np.abs(output.astype(np.int16) - golden.astype(np.int16)).max(axis=-1)
+    fraction = np.count_nonzero(difference > tolerance) / float(difference.size)
+    return fraction <= threshold, fraction, int(difference.max())
+
+
+def render_spec(output, path, spec):
+    """Render the first canvas of a .root file restyled by a spec file to a .png, as
+    the restyle.py script next to the spec does.
+    """
+    from .batch import restyle
+    from .transforms import SpecTransform
+    transform = SpecTransform.from_file(spec)
+    rendered, = restyle(path, transform, os.path.dirname(output), suffix='', formats=('png',))
+    if rendered != output:
+        shutil.move(rendered, output)
+    return output
+
+
+def _check_worker(task):
+    """Render a figure within a worker process and compare it against its golden
+    image, or replace the golden image with it if updating.
+    """
+    figure, golden_dir, output_dir, tolerance, threshold, update = task
+    output = os.path.join(output_dir, figure.name + '.png')
+    golden = os.path.join(golden_dir, figure.name + '.png')
+    try:
+        for directory in (os.path.dirname(output), os.path.dirname(golden)):
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+        figure.render(output, *figure.args)
+        if update:
+            shutil.copyfile(output, golden)
+            return Comparison(figure.name, output, golden, True, 0., 0, None)
+        if not os.path.isfile(golden):
+            return Comparison(figure.name, output, golden, False, None, None, (
+                'No golden image at {}, create it by checking with update.\n'.format(golden)))
+        passed, fraction, max_difference = compare_images(
+            read_image(output), read_image(golden), tolerance, threshold)
+    except Exception:
+        return Comparison(figure.name, output, golden, False, None, None, traceback.format_exc())
+    return Comparison(figure.name, output, golden, passed, fraction, max_difference, None)
+
+
+def check(figures, golden_dir, output_dir, jobs=None, tolerance=2, threshold=1e-4, update=False):
+    """Render figures and check them against their golden images over a pool of worker
+    processes, so that a change to the styling code can be validated across every
+    figure at once.
+
+    Parameters
+    ----------
+    figures : iterable of Figure
+        The figures to check.
+
+    golden_dir : string
+        The directory holding the golden images.
+
+    output_dir : string
+        The directory in which to render the figures.
+
+    jobs : int, optional
+        The number of worker processes. The default is None for the number of CPUs.
+
+    tolerance : int, optional
+        The per-pixel tolerance (see compare_images). The default is 2.
+
+    threshold : float, optional
+        The fraction of the pixels which may differ (see compare_images).
+        The default is 1e-4.
+
+    update : bool, optional
+        Whether to replace the golden images with the rendered figures instead of
+        comparing them, after an intended change of style. The default is False.
+
+    Returns
+    -------
+    comparisons : list of Comparison
+        The comparison for each figure, in the order of the figures.
+    """
+    tasks = [(figure, golden_dir, output_dir, tolerance, threshold, update) for figure in figures]
+    if not tasks:
+        return []
+    if jobs is None:
+        jobs = multiprocessing.cpu_count()
+    # Each figure is rendered in a fresh process, so that the ROOT globals touched by
+    # one figure, e.g. gStyle, never leak into the next. ROOT is loaded up front so
+    # that the processes are forked with it rather than each loading it again.
+    from rootpy import ROOT
+    ROOT.gROOT.SetBatch(True)
+    pool = multiprocessing.Pool(min(jobs, len(tasks)), maxtasksperchild=1)
+    try:
+        comparisons = pool.map(_check_worker, tasks, chunksize=1)
+    finally:
+        pool.terminate()
+        pool.join()
+    return comparisons
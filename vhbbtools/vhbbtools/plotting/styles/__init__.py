@@ -1 +1,10 @@
-from .tdr_style import TDRStyle
+from ...lazy import lazy_import
+
+
+lazy_import(__name__, {
+    'TDRStyle': '.tdr_style',
+    'get_style': '.registry',
+    'register_style': '.registry',
+    'reset_style': '.registry',
+    'use_style': '.registry',
+})
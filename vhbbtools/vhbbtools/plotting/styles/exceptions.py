@@ -0,0 +1,2 @@
+class StyleError(Exception):
+    pass
@@ -0,0 +1,94 @@
+from collections import defaultdict
+
+from rootpy import ROOT
+
+from .exceptions import StyleError
+from .tdr_style import TDRStyle
+
+
+__all__ = [
+    'get_style',
+    'register_style',
+    'reset_style',
+    'use_style',
+]
+
+
+# The factories of the named styles and the styles constructed from them so far.
+_FACTORIES = {
+    'tdrStyle': TDRStyle,
+}
+_STYLES = {}
+
+# A copy of each constructed style as it was constructed, and the number of contexts in
+# which each style is in use, so that it is restored once the last of them is left.
+_SNAPSHOTS = {}
+_ACTIVE = defaultdict(int)
+
+
+def register_style(name, factory):
+    """Register a factory, e.g. a Style subclass, that constructs the named style.
+    """
+    _FACTORIES[name] = factory
+    reset_style(name)
+
+
+def get_style(name):
+    """Return the named style. It is constructed on first use and cached for the
+    lifetime of the process, so every later call is a dictionary lookup.
+    """
+    try:
+        return _STYLES[name]
+    except KeyError:
+        pass
+    try:
+        factory = _FACTORIES[name]
+    except KeyError:
+        raise StyleError('Unregistered style: {}'.format(name))
+    style = factory()
+    snapshot = ROOT.TStyle('{}_snapshot'.format(name), '')
+    style.Copy(snapshot)
+    _STYLES[name] = style
+    _SNAPSHOTS[name] = snapshot
+    return style
+
+
+def reset_style(name):
+    """Discard the cached instance of the named style, e.g. to undo changes made to it
+    outside of use_style. It is constructed anew on its next use.
+    """
+    _STYLES.pop(name, None)
+    _SNAPSHOTS.pop(name, None)
+
+
+class use_style(object):
+    """A context manager making the named style the current gStyle and restoring the
+    previous one on exit. Both switches only swap the gStyle pointer.
+
+    The changes made to gStyle within the context, e.g. by the style calls of a spec,
+    are undone on exit by copying back the settings the style was constructed with,
+    so that they do not leak into the later uses of the cached style. If the style is
+    in use by nested contexts, it is restored on leaving the outermost one.
+
+    Parameters
+    ----------
+    name : string
+        The name of a registered style, e.g. 'tdrStyle'.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.style = get_style(name)
+        self.previous_style = None
+
+    def __enter__(self):
+        self.previous_style = ROOT.gStyle
+        _ACTIVE[self.name] += 1
+        self.style.cd()
+        return self.style
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.previous_style.cd()
+        _ACTIVE[self.name] -= 1
+        snapshot = _SNAPSHOTS.get(self.name)
+        if not _ACTIVE[self.name] and snapshot is not None:
+            snapshot.Copy(self.style)
@@ -1,5 +1,5 @@
 from rootpy import ROOT
-from rootpy.plotting.style import Style, get_style, set_style
+from rootpy.plotting.style import Style
 
 
 class TDRStyle(Style):
@@ -99,12 +99,12 @@ class TDRStyle(Style):
     def __enter__(self):
         """Override the __enter__ method to remember the current gStyle.
         """
-        self.old_gStyle = get_style(ROOT.gStyle.GetName())
-        set_style(self)
+        self.old_gStyle = ROOT.gStyle
+        self.cd()
         return self
 
     def __exit__(self, exception_type, exception_value, traceback):
         """Override the __exit__ method to reset to the old gStyle.
         """
-        set_style(self.old_gStyle)
+        self.old_gStyle.cd()
 
@@ -0,0 +1,3 @@
+from .bases import BaseTransform
+from .primitive_index import PrimitiveIndex
+from .spec import SpecTransform, load_spec
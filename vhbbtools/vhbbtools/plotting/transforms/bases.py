@@ -0,0 +1,28 @@
+__all__ = [
+    'BaseTransform',
+]
+
+
+class BaseTransform(object):
+    """The base transform class. A transform ports the primitives of a canvas read from
+    a .root file over to a new CMSCanvas, restyling them along the way.
+
+    Subclasses implement __call__ and may override canvas_options. Instances are sent to
+    the worker processes of a batch, so subclasses must be defined at module level.
+    """
+
+    # The keyword arguments passed to the CMSCanvas constructor.
+    canvas_options = {}
+
+    def __call__(self, old_canvas, new_canvas):
+        """Restyle the primitives of old_canvas and draw them on new_canvas, which is
+        the active canvas with the TDR style set.
+        """
+        raise NotImplementedError
+
+    def fingerprint(self):
+        """Return a string determining the output of the transform, which keys the cache
+        of restyled figures along with the input file. The default is None for a transform
+        whose output cannot be cached.
+        """
+        return None
@@ -0,0 +1,6 @@
+class SpecError(Exception):
+    pass
+
+
+class PrimitiveNotFoundError(Exception):
+    pass
@@ -0,0 +1,101 @@
+from .exceptions import PrimitiveNotFoundError
+
+
+__all__ = [
+    'PrimitiveIndex',
+]
+
+
+# The names of a class and all of its base classes, keyed by the class name.
+_LINEAGES = {}
+
+
+def _lineage(obj):
+    """Return the names of the class of a ROOT object and all of its base classes.
+    """
+    tclass = obj.IsA()
+    name = tclass.GetName()
+    try:
+        return _LINEAGES[name]
+    except KeyError:
+        pass
+    names = [name]
+    bases = list(tclass.GetListOfBases())
+    while bases:
+        base = bases.pop().GetClassPointer()
+        if base and base.GetName() not in names:
+            names.append(base.GetName())
+            bases.extend(base.GetListOfBases())
+    _LINEAGES[name] = tuple(names)
+    return _LINEAGES[name]
+
+
+class PrimitiveIndex(object):
+    """An index of the primitives of a pad by class and name, built by a single pass
+    over its list of primitives. A primitive is indexed under its own class and every
+    one of its base classes, so that e.g. 'TH1' finds TH1F and TH1D histograms alike.
+
+    The index is a snapshot of the primitives in drawing order, so looking them up
+    is unaffected by primitives being moved or removed from the pad afterwards.
+
+    Parameters
+    ----------
+    pad : TPad
+        The pad whose primitives are indexed.
+    """
+    def __init__(self, pad):
+        self.primitives = pad.GetListOfPrimitives()
+        self.entries = []
+        self._positions = {}
+        link = self.primitives.FirstLink()
+        while link:
+            obj = link.GetObject()
+            position = len(self.entries)
+            self.entries.append((obj, link.GetOption()))
+            name = obj.GetName()
+            self._positions.setdefault((None, name), []).append(position)
+            for class_name in _lineage(obj):
+                self._positions.setdefault((class_name, None), []).append(position)
+                self._positions.setdefault((class_name, name), []).append(position)
+            link = link.Next()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, position):
+        return self.entries[position][0]
+
+    def find(self, cls=None, name=None):
+        """Return the list of (object, draw option) pairs of the primitives of the given
+        class and/or name, in drawing order. Both None matches every primitive.
+        """
+        if cls is None and name is None:
+            return list(self.entries)
+        return [self.entries[position] for position in self._positions.get((cls, name), ())]
+
+    def get(self, cls=None, name=None, index=0):
+        """Return the primitive of the given class and/or name. If several match, index
+        picks one of them in drawing order, counting from the end if negative.
+        """
+        matches = self.find(cls, name)
+        try:
+            return matches[index][0]
+        except IndexError:
+            raise PrimitiveNotFoundError(
+                'No primitive with class {!s}, name {!s}, and index {:d} among {:d} match(es).'.format(
+                    cls, name, index, len(matches)))
+
+    def option(self, obj):
+        """Return the draw option of a primitive when the index was built.
+        """
+        for entry, option in self.entries:
+            if entry is obj:
+                return option
+        raise PrimitiveNotFoundError('Primitive not in index: {!r}'.format(obj))
+
+    def replace(self, obj, new_obj, option=None):
+        """Substitute a new object for a primitive in the index, e.g. after cloning it.
+        """
+        for position, (entry, entry_option) in enumerate(self.entries):
+            if entry is obj:
+                self.entries[position] = (new_obj, entry_option if option is None else option)
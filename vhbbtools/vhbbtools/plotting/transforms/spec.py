@@ -0,0 +1,584 @@
+import json
+import os
+import re
+from collections import OrderedDict
+
+from ...instrumentation import count
+from ...stats import chi2_ndf
+from .bases import BaseTransform
+from .exceptions import PrimitiveNotFoundError, SpecError
+from .primitive_index import PrimitiveIndex
+
+
+__all__ = [
+    'SpecTransform',
+    'load_spec',
+]
+
+
+# A segment of a method path, i.e. a method name optionally followed by an index
+# into the sequence it returns, or by [*] to iterate over all of its items.
+METHOD_SEGMENT = re.compile(r'^([A-Za-z_]\w*)(?:\[(\*|-?\d+)\])?$')
+
+# A positional selector given as a Python-like slice, e.g. '6:' or '2:14'.
+SLICE_SELECTOR = re.compile(r'^(-?\d*):(-?\d*)$')
+
+
+def load_spec(path):
+    """Load a transform spec from a .json, .yaml, or .yml file, raising SpecError if it
+    cannot be parsed.
+    """
+    _, extension = os.path.splitext(path)
+    if extension == '.json':
+        with open(path) as f:
+            try:
+                return json.load(f, object_pairs_hook=OrderedDict)
+            except ValueError as error:
+                raise SpecError('Malformed JSON: {}'.format(error))
+    elif extension in ('.yaml', '.yml'):
+        import yaml
+        with open(path) as f:
+            try:
+                return _load_yaml(f)
+            except yaml.YAMLError as error:
+                raise SpecError('Malformed YAML: {}'.format(error))
+    raise SpecError('Unrecognized spec file extension: {}'.format(extension))
+
+
+def _load_yaml(stream):
+    """Load YAML with its mappings as OrderedDicts, so that setter calls are made in the
+    order in which they are written.
+    """
+    import yaml
+
+    class OrderedSafeLoader(yaml.SafeLoader):
+        pass
+
+    def construct_mapping(loader, node):
+        loader.flatten_mapping(node)
+        return OrderedDict(loader.construct_pairs(node))
+
+    OrderedSafeLoader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, construct_mapping)
+    return yaml.load(stream, Loader=OrderedSafeLoader)
+
+
+def _check_keys(mapping, allowed, where):
+    if not isinstance(mapping, dict):
+        raise SpecError('Expected a mapping for {}, got: {!r}'.format(where, mapping))
+    for key in mapping:
+        if key not in allowed:
+            raise SpecError('Unrecognized key in {}: {}'.format(where, key))
+
+
+def _compile_path(path):
+    """Split a method path like 'GetListOfPrimitives[-1].SetLabel' into the chain of
+    (getter, index) pairs leading up to the object and the name of the method to call.
+    """
+    chain = []
+    for segment in path.split('.'):
+        match = METHOD_SEGMENT.match(segment)
+        if match is None:
+            raise SpecError('Invalid method path: {}'.format(path))
+        name, index = match.groups()
+        if index is not None and index != '*':
+            index = int(index)
+        chain.append((name, index))
+    method, index = chain.pop()
+    if index is not None:
+        raise SpecError('Method path must end with a method call: {}'.format(path))
+    return tuple(chain), method
+
+
+def _compile_slice(value):
+    match = SLICE_SELECTOR.match(str(value))
+    if match is None:
+        raise SpecError('Unrecognized selector index: {!r}'.format(value))
+    return slice(*[int(bound) if bound else None for bound in match.groups()])
+
+
+class _Selector(object):
+    """Selects (object, draw option) pairs from the PrimitiveIndex of a pad, either by
+    position in the drawing order or by class and/or name and an index into the matches.
+    """
+    def __init__(self, value):
+        if isinstance(value, dict):
+            _check_keys(value, ('class', 'name', 'index'), 'selector')
+            self.cls = value.get('class')
+            self.name = value.get('name')
+            value = value.get('index', 0)
+        else:
+            self.cls = self.name = None
+        self.index = value if isinstance(value, int) else _compile_slice(value)
+
+    def __call__(self, index):
+        matches = index.find(self.cls, self.name)
+        if isinstance(self.index, slice):
+            return matches[self.index]
+        try:
+            return [matches[self.index]]
+        except IndexError:
+            raise PrimitiveNotFoundError(
+                'No primitive with class {!s}, name {!s}, and index {:d} among {:d} match(es).'.format(
+                    self.cls, self.name, self.index, len(matches)))
+
+
+class _Condition(object):
+    """Checks the number of primitives of a pad, optionally of a given class and/or
+    name, against an expected count, e.g. to tell apart inputs with four or five texts.
+    """
+    def __init__(self, value, where):
+        _check_keys(value, ('class', 'name', 'count'), where)
+        if not isinstance(value.get('count'), int):
+            raise SpecError('Expected an integer count for {}, got: {!r}'.format(where, value))
+        self.cls = value.get('class')
+        self.name = value.get('name')
+        self.count = value['count']
+
+    def __call__(self, index):
+        return len(index.find(self.cls, self.name)) == self.count
+
+
+def _compile_guard(spec, where):
+    """Return a function of the PrimitiveIndex of a pad telling whether the spec applies
+    to it according to its if and unless conditions, or None if it always applies.
+    """
+    required = _Condition(spec['if'], 'if condition of ' + where) if 'if' in spec else None
+    excluded = _Condition(spec['unless'], 'unless condition of ' + where) if 'unless' in spec else None
+    if required is None and excluded is None:
+        return None
+
+    def guard(index):
+        if required is not None and not required(index):
+            return False
+        return excluded is None or not excluded(index)
+    return guard
+
+
+def _compile_args(value):
+    """Return the tuple of compiled arguments and whether any must be resolved per pad.
+    A list holds several arguments and any other value is a single argument.
+    """
+    if not isinstance(value, list):
+        value = [value]
+    args = tuple(_compile_arg(arg) for arg in value)
+    return args, any(isinstance(arg, _Dynamic) for arg in args)
+
+
+def _compile_arg(arg):
+    if not isinstance(arg, dict):
+        return arg
+    if 'format' in arg:
+        _check_keys(arg, ('format',), 'format argument')
+        return _Format(arg['format'])
+    if 'select' in arg:
+        _check_keys(arg, ('select', 'get', 'args'), 'primitive reference')
+        if 'args' in arg and 'get' not in arg:
+            raise SpecError('Primitive reference has args but no getter: {!r}'.format(arg))
+        getter = _compile_path(arg['get']) if 'get' in arg else None
+        args, _ = _compile_args(arg.get('args', []))
+        return _Reference(_Selector(arg['select']), getter, args)
+    raise SpecError('Unrecognized argument: {!r}'.format(arg))
+
+
+def _compile_calls(mapping, where):
+    if not isinstance(mapping, dict):
+        raise SpecError('Expected a mapping for {}, got: {!r}'.format(where, mapping))
+    calls = []
+    for path, value in mapping.items():
+        chain, method = _compile_path(path)
+        args, dynamic = _compile_args(value)
+        calls.append(_Call(chain, method, args, dynamic))
+    return calls
+
+
+def _walk(obj, chain):
+    """Follow a chain of (getter, index) pairs and return the objects it leads to.
+    """
+    targets = [obj]
+    for name, index in chain:
+        values = [getattr(target, name)() for target in targets]
+        if index is None:
+            targets = values
+        elif index == '*':
+            targets = [item for value in values for item in value]
+        else:
+            targets = [value[index] for value in values]
+    return targets
+
+
+class _Dynamic(object):
+    """An argument whose value is only known once the pad is being transformed.
+    """
+    def resolve(self, state):
+        raise NotImplementedError
+
+
+class _Format(_Dynamic):
+    """A string formatted with the values computed so far, e.g. {chi2:.2f}.
+    """
+    def __init__(self, template):
+        self.template = template
+
+    def resolve(self, state):
+        return self.template.format(**state.context)
+
+
+class _Reference(_Dynamic):
+    """A primitive of the pad or a value returned by a getter path on it, whose last
+    getter may be called with arguments, e.g. GetXaxis.GetBinLowEdge with a bin number.
+    """
+    def __init__(self, selector, getter, args=()):
+        self.selector = selector
+        self.getter = getter
+        self.args = args
+
+    def resolve(self, state):
+        entries = self.selector(state.index)
+        if len(entries) != 1:
+            raise SpecError('A primitive reference must select exactly one primitive.')
+        obj = entries[0][0]
+        if self.getter is None:
+            return obj
+        chain, method = self.getter
+        args = [arg.resolve(state) if isinstance(arg, _Dynamic) else arg for arg in self.args]
+        return getattr(_walk(obj, chain)[0], method)(*args)
+
+
+class _Call(object):
+    """A precompiled setter call, i.e. the method reached by following a getter
+    chain from the target object and the arguments to call it with.
+    """
+    __slots__ = ('chain', 'method', 'args', 'dynamic')
+
+    def __init__(self, chain, method, args, dynamic):
+        self.chain = chain
+        self.method = method
+        self.args = args
+        self.dynamic = dynamic
+
+    def __call__(self, obj, state):
+        args = self.args
+        if self.dynamic:
+            args = [arg.resolve(state) if isinstance(arg, _Dynamic) else arg for arg in args]
+        targets = _walk(obj, self.chain) if self.chain else (obj,)
+        for target in targets:
+            getattr(target, self.method)(*args)
+
+
+class _PadState(object):
+    """The state of a pad while it is being transformed, i.e. the index of its primitives,
+    the values computed so far for format arguments, and whether to restyle in place.
+    """
+    def __init__(self, pad, context, inplace):
+        self.index = PrimitiveIndex(pad)
+        self.primitives = self.index.primitives
+        self.context = context
+        self.inplace = inplace
+
+
+def _find_link(primitives, obj):
+    """Return the last link of an object in a list of primitives, which draws it on top,
+    or None if the object is not in the list, e.g. if an earlier step removed it.
+    """
+    found = None
+    link = primitives.FirstLink()
+    while link:
+        if link.GetObject() is obj:
+            found = link
+        link = link.Next()
+    return found
+
+
+class _PrimitiveStep(object):
+    """The compiled form of an entry in the primitives list of a pad spec.
+    """
+    def __init__(self, spec):
+        _check_keys(spec, ('select', 'if', 'unless', 'set', 'option', 'raise', 'remove', 'copies'), 'primitive spec')
+        if 'select' not in spec:
+            raise SpecError('Primitive spec is missing a selector: {!r}'.format(spec))
+        self.guard = _compile_guard(spec, 'primitive spec')
+        self.selector = _Selector(spec['select'])
+        self.calls = _compile_calls(spec.get('set', {}), 'set')
+        self.option = spec.get('option')
+        self.raise_ = spec.get('raise', False)
+        self.remove = spec.get('remove', False)
+        self.copies = []
+        for copy in spec.get('copies', []):
+            _check_keys(copy, ('set',), 'copy spec')
+            self.copies.append(_compile_calls(copy.get('set', {}), 'set'))
+
+    def apply(self, state):
+        if self.guard is not None and not self.guard(state.index):
+            return
+        for obj, option in self.selector(state.index):
+            count('primitives')
+            if self.remove:
+                state.primitives.Remove(obj)
+                continue
+            for call in self.calls:
+                call(obj, state)
+            if self.option is not None or self.raise_:
+                obj, option = self._move_to_top(obj, option, state)
+            for calls in self.copies:
+                copy = obj.Clone()
+                count('clones')
+                for call in calls:
+                    call(copy, state)
+                state.primitives.Add(copy, option)
+
+    def _move_to_top(self, obj, option, state):
+        """Move a primitive to the top of the pad, with the new draw option if any, and
+        return the primitive now drawn on top along with its draw option.
+        """
+        if self.option is not None:
+            option = self.option
+        if state.inplace:
+            link = _find_link(state.primitives, obj)
+            if link is None:
+                # The primitive was removed by an earlier step, so it is only added back.
+                pass
+            elif obj.InheritsFrom('TH1') and 'SAME' not in (link.GetOption() or '').upper():
+                # The histogram paints the axes of the pad, so it stays in place drawing
+                # only them and is added again on top. A TList may hold an object twice.
+                link.SetOption('AXIS')
+            else:
+                state.primitives.Remove(link)
+            state.primitives.Add(obj, option)
+            state.index.replace(obj, obj, option)
+            return obj, option
+        # Otherwise clone the primitive and draw the clone on top, emptying the original
+        # if it is a histogram whose draw option changes.
+        new_obj = obj.Clone()
+        count('clones')
+        if self.option is not None and obj.InheritsFrom('TH1'):
+            obj.Reset()
+        else:
+            state.primitives.Remove(obj)
+        state.primitives.Add(new_obj, option)
+        state.index.replace(obj, new_obj, option)
+        return new_obj, option
+
+
+class _Addition(object):
+    """The compiled form of an entry in the add list of a pad spec.
+    """
+    def __init__(self, spec):
+        _check_keys(spec, ('class', 'if', 'unless', 'args', 'set', 'option'), 'add spec')
+        if 'class' not in spec:
+            raise SpecError('Add spec is missing a class: {!r}'.format(spec))
+        self.guard = _compile_guard(spec, 'add spec')
+        self.class_name = spec['class']
+        self.args, self.dynamic = _compile_args(spec.get('args', []))
+        self.calls = _compile_calls(spec.get('set', {}), 'set')
+        self.option = spec.get('option', '')
+
+    def apply(self, state):
+        if self.guard is not None and not self.guard(state.index):
+            return
+        from rootpy import ROOT
+        args = self.args
+        if self.dynamic:
+            args = [arg.resolve(state) if isinstance(arg, _Dynamic) else arg for arg in args]
+        obj = getattr(ROOT, self.class_name)(*args)
+        for call in self.calls:
+            call(obj, state)
+        state.primitives.Add(obj, self.option)
+
+
+class _Ratio(object):
+    """The compiled form of the ratio entry of a pad spec.
+    """
+    def __init__(self, spec):
+        _check_keys(spec, ('pad', 'data', 'mc', 'syst', 'replace'), 'ratio spec')
+        for key in ('pad', 'data', 'mc'):
+            if key not in spec:
+                raise SpecError('Ratio spec is missing {}: {!r}'.format(key, spec))
+        self.source = spec['pad']
+        self.data = _Reference(_Selector(spec['data']), None)
+        self.mc = _Reference(_Selector(spec['mc']), None)
+        self.syst = spec.get('syst')
+        self.replace = spec.get('replace', False)
+
+    def generate(self, pad, name, states):
+        """Return the pad filled with the ratio of the data to the MC of the source pad,
+        creating it if the canvas lacks it. An existing pad is returned as it is unless
+        it is to be replaced.
+        """
+        from rootpy import ROOT
+        from ..ratio import fill_ratio_pad
+        if pad and not self.replace:
+            return pad
+        try:
+            source = states[self.source]
+        except KeyError:
+            raise SpecError('Ratio source pad must precede the ratio pad: {}'.format(self.source))
+        data, mc = self.data.resolve(source), self.mc.resolve(source)
+        if pad:
+            pad.GetListOfPrimitives().Clear()
+        else:
+            pad = ROOT.TPad(name, name, 0., 0., 1., 1.)
+            pad.SetBit(ROOT.kCanDelete)
+            ROOT.SetOwnership(pad, False)
+        fill_ratio_pad(pad, data, mc, self.syst)
+        return pad
+
+
+class _PadTransform(object):
+    """The compiled form of a pad spec.
+    """
+    def __init__(self, spec):
+        _check_keys(spec, ('name', 'set', 'primitives', 'add', 'decorate', 'chi2', 'ratio'), 'pad spec')
+        if 'name' not in spec:
+            raise SpecError('Pad spec is missing a name: {!r}'.format(spec))
+        self.name = spec['name']
+        self.calls = _compile_calls(spec.get('set', {}), 'set')
+        self.steps = [_PrimitiveStep(step) for step in spec.get('primitives', [])]
+        self.additions = [_Addition(addition) for addition in spec.get('add', [])]
+        self.decorate = spec.get('decorate', False)
+        self.chi2 = None
+        if 'chi2' in spec:
+            _check_keys(spec['chi2'], ('data', 'mc'), 'chi2 spec')
+            self.chi2 = (
+                _Reference(_Selector(spec['chi2']['data']), None),
+                _Reference(_Selector(spec['chi2']['mc']), None),
+            )
+        self.ratio = _Ratio(spec['ratio']) if 'ratio' in spec else None
+
+    def apply(self, pad, context, inplace):
+        state = _PadState(pad, context, inplace)
+        for call in self.calls:
+            call(pad, state)
+        for step in self.steps:
+            step.apply(state)
+        if self.chi2 is not None:
+            data, mc = [reference.resolve(state) for reference in self.chi2]
+            context['chi2'] = chi2_ndf(data, mc)
+        for addition in self.additions:
+            addition.apply(state)
+        return state
+
+
+class SpecTransform(BaseTransform):
+    """A transform described by a declarative spec, which is compiled once into flat
+    lists of setter calls so that applying it to each file only costs the ROOT calls.
+
+    The spec is a mapping, e.g. loaded from a YAML or JSON file, with the keys:
+    * canvas : mapping, optional
+      The keyword arguments passed to the CMSCanvas constructor.
+
+    * style : mapping, optional
+      The global settings applied after entering the canvas, mapping method paths
+      rooted at a ROOT global to their arguments, e.g. {'gStyle.SetErrorX': 0}.
+
+    * decorations : mapping, optional
+      The keyword arguments passed to vhbbtools.plotting.decorate for the decorated pads.
+
+    * pads : list of mappings
+      The pads of the old canvas to port over, in drawing order, each with the keys:
+      - name : string
+        The name of the pad in the old canvas, e.g. 'oben'.
+      - set : mapping, optional
+        The setter calls on the pad.
+      - primitives : list of mappings, optional
+        The steps applied to the primitives of the pad, in order, each with the keys
+        select (the selector), set (the setter calls), option (redraw on top with this
+        draw option), raise (redraw on top), remove (remove from the pad), and copies (a
+        list of mappings with the setter calls for copies drawn on top).
+      - add : list of mappings, optional
+        The new primitives drawn on top, each with the keys class (the ROOT class name),
+        args (the constructor arguments), set (the setter calls), and option.
+      - chi2 : mapping, optional
+        The data and mc selectors of the histograms for which the chi2/NDF is computed
+        by vhbbtools.stats.chi2_ndf and made available to format arguments as chi2.
+      - ratio : mapping, optional
+        The keys pad (the name of a preceding pad), data and mc (the selectors of the
+        histograms on that pad), syst (the relative systematic uncertainty, optional),
+        and replace (whether to replace an existing pad, optional). If the canvas lacks
+        the pad or it is to be replaced, the pad is generated by
+        vhbbtools.plotting.ratio.fill_ratio_pad before the rest of its spec is applied.
+      - decorate : bool, optional
+        Whether to draw the CMS plot decorations on the pad. The default is False.
+
+    A selector picks primitives by their place in the drawing order of the pad before
+    any step, either as an index like 3 or a slice like '6:', or by their class and/or
+    name as a mapping like {'class': 'TLegend', 'index': 1} or {'class': 'TLatex',
+    'index': '2:'}, in which the index into the matches defaults to 0. The class matches
+    derived classes too, e.g. 'TH1' matches TH1F. A selector with an index and no match
+    raises PrimitiveNotFoundError.
+
+    A primitive step or addition may also have the keys if and unless, each a condition
+    like {'class': 'TLatex', 'count': 5}, which holds if the pad has exactly that many
+    primitives of the class and/or name before any step, or that many primitives at all
+    if neither is given. The entry is skipped unless its if condition holds and its
+    unless condition does not, e.g. to handle inputs which differ in their texts.
+
+    A setter call maps a method path to its arguments. The path is a chain of getters
+    ending in a setter, where a getter may be indexed, e.g. 'GetListOfPrimitives[-1]',
+    or iterated, e.g. 'GetHists[*]'. A list holds several arguments and any other value
+    a single one. An argument may also be a mapping, either {'format': template} for a
+    string formatted with the computed values or {'select': selector} for a primitive of
+    the pad, optionally with 'get' naming a getter path whose value is used instead and
+    'args' holding the arguments of its last getter, which may be references too, e.g.
+    {'select': 1, 'get': 'GetXaxis.GetBinLowEdge', 'args': {'select': 1, 'get':
+    'GetXaxis.GetFirst'}}.
+
+    Parameters
+    ----------
+    spec : mapping
+        The transform spec.
+
+    inplace : bool, optional
+        Whether to restyle the primitives in place, i.e. to move the primitives that are
+        redrawn on top within the list of primitives of the pad. A histogram drawn
+        without SAME, which paints the axes, stays in place drawn with the option AXIS
+        and is added to the list again on top. Otherwise, the primitives are
+        cloned and the original is emptied or removed, as the restyle.py scripts used to
+        do. The default is True.
+    """
+    def __init__(self, spec, inplace=True):
+        _check_keys(spec, ('canvas', 'style', 'decorations', 'pads'), 'spec')
+        self.spec = spec
+        self.inplace = inplace
+        self.canvas_options = dict(spec.get('canvas', {}))
+        self.decorations = dict(spec.get('decorations', {}))
+        self.style_calls = []
+        for path, value in spec.get('style', {}).items():
+            chain, method = _compile_path(path)
+            if not chain or chain[0][1] is not None:
+                raise SpecError('Style path must start with a ROOT global: {}'.format(path))
+            args, dynamic = _compile_args(value)
+            if dynamic:
+                raise SpecError('Style arguments must be constants: {}'.format(path))
+            self.style_calls.append((chain[0][0], _Call(chain[1:], method, args, False)))
+        self.pads = [_PadTransform(pad) for pad in spec.get('pads', [])]
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Create the transform from a spec file (see load_spec).
+        """
+        return cls(load_spec(path), **kwargs)
+
+    def fingerprint(self):
+        return json.dumps({'spec': self.spec, 'inplace': self.inplace}, sort_keys=True)
+
+    def __call__(self, old_canvas, new_canvas):
+        from rootpy import ROOT
+        from ..decorations import decorate
+        for name, call in self.style_calls:
+            # Resolve the global on every call since entering the canvas swaps gStyle.
+            call(getattr(ROOT, name), None)
+        context = {}
+        states = {}
+        for pad_transform in self.pads:
+            pad = old_canvas.GetPrimitive(pad_transform.name)
+            if pad_transform.ratio is not None:
+                pad = pad_transform.ratio.generate(pad, pad_transform.name, states)
+            if not pad:
+                raise SpecError('Pad not found in canvas: {}'.format(pad_transform.name))
+            states[pad_transform.name] = pad_transform.apply(pad, context, self.inplace)
+            pad.Draw()
+            if pad_transform.decorate:
+                decorate(pad, **self.decorations)
+            pad.Modified()
+            pad.Update()
+            pad.RedrawAxis()
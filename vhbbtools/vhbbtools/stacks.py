@@ -0,0 +1,153 @@
+import numbers
+
+import numpy as np
+
+from .stats import bin_contents, bin_variances
+
+
+__all__ = [
+    'StackArray',
+]
+
+
+def _edges(hist):
+    """Return the bin edges of the x-axis of a histogram.
+    """
+    x_axis = hist.GetXaxis()
+    return np.array([x_axis.GetBinLowEdge(i) for i in range(1, x_axis.GetNbins() + 2)])
+
+
+class StackArray(object):
+    """The component histograms of a THStack as 2-D NumPy arrays of shape (components,
+    cells), so that bulk edits like rebinning, normalising, or scaling the signal are
+    applied to every component by a single vectorised operation.
+
+    The arrays are filled from zero-copy views of the bin contents and sums of squared
+    weights of the histograms (see vhbbtools.stats), and write copies them back the same
+    way. The cells include the underflow and overflow, so the bins are cells[:, 1:-1].
+
+    The following attributes are available:
+    * hists : list of TH1
+      The component histograms, in stacking order.
+
+    * names : list of strings
+      The names of the component histograms.
+
+    * edges : array of floats
+      The bin edges shared by the components.
+
+    * contents : array of floats
+      The bin contents of each component.
+
+    * variances : array of floats
+      The squared bin errors of each component.
+
+    Parameters
+    ----------
+    stack : THStack
+        The stack, whose components must all have the same binning.
+    """
+    def __init__(self, stack):
+        self.stack = stack
+        self.hists = list(stack.GetHists())
+        if not self.hists:
+            raise ValueError('The stack has no histograms.')
+        self.names = [hist.GetName() for hist in self.hists]
+        self.edges = _edges(self.hists[0])
+        ncells = len(self.edges) + 1
+        if any(hist.GetNcells() != ncells for hist in self.hists):
+            raise ValueError('The histograms of the stack must have the same binning.')
+        self.contents = np.empty((len(self.hists), ncells))
+        self.variances = np.empty((len(self.hists), ncells))
+        for i, hist in enumerate(self.hists):
+            self.contents[i] = bin_contents(hist, overflow=True)
+            self.variances[i] = bin_variances(hist, overflow=True)
+        self._rebinned = False
+
+    def __len__(self):
+        return len(self.hists)
+
+    @property
+    def bins(self):
+        """The contents of the bins of each component, excluding the underflow and overflow.
+        """
+        return self.contents[:, 1:-1]
+
+    def total(self):
+        """Return the contents and variances of the sum of the components.
+        """
+        return self.contents.sum(axis=0), self.variances.sum(axis=0)
+
+    def scale(self, factors):
+        """Scale the components, like TH1::Scale but for all of them at once.
+
+        Parameters
+        ----------
+        factors : float, sequence of floats, or dict
+            The factor for every component, for each component in stacking order, or
+            keyed by the names of the components to scale, e.g. {'ZH': 20.}.
+        """
+        if isinstance(factors, dict):
+            factors = [factors.get(name, 1.) for name in self.names]
+        factors = np.broadcast_to(np.asarray(factors, dtype=np.float64), (len(self),))
+        self.contents *= factors[:, np.newaxis]
+        self.variances *= factors[:, np.newaxis] ** 2
+
+    def normalize(self, to=1.):
+        """Scale each component so that the sum of its bins equals the given value.
+        Empty components are left as they are.
+        """
+        integrals = self.bins.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            factors = np.where(integrals != 0, to / integrals, 1.)
+        self.scale(factors)
+
+    def rebin(self, ngroup=None, edges=None):
+        """Merge adjacent bins of every component, like TH1::Rebin.
+
+        Parameters
+        ----------
+        ngroup : int, optional
+            The number of bins to merge into one, which must be a positive divisor of
+            the number of bins.
+
+        edges : sequence of floats, optional
+            The new bin edges instead, which must be a subset of the current ones. The
+            bins outside of them are merged into the underflow and overflow.
+        """
+        if edges is None:
+            nbins = len(self.edges) - 1
+            if not isinstance(ngroup, numbers.Integral) or ngroup < 1 or nbins % ngroup:
+                raise ValueError('The number of bins to merge must be a positive divisor of {:d}, got: {!r}'.format(
+                    nbins, ngroup))
+            edges = self.edges[::ngroup]
+        edges = np.asarray(edges, dtype=np.float64)
+        indices = np.searchsorted(self.edges, edges)
+        if (
+            len(edges) < 2
+            or np.any(np.diff(indices) <= 0)
+            or indices[-1] >= len(self.edges)
+            or not np.allclose(self.edges[indices], edges)
+        ):
+            raise ValueError('The new bin edges must be an increasing subset of the current ones.')
+        # The underflow merges the cells below the first new edge and each new bin
+        # starts at the cell of its low edge, the last one being the overflow.
+        starts = np.concatenate(([0], indices + 1))
+        self.contents = np.add.reduceat(self.contents, starts, axis=1)
+        self.variances = np.add.reduceat(self.variances, starts, axis=1)
+        self.edges = edges
+        self._rebinned = True
+
+    def write(self):
+        """Copy the arrays back into the histograms and mark the stack as modified, so
+        that its sum is recomputed when it is next drawn.
+        """
+        for hist, contents, variances in zip(self.hists, self.contents, self.variances):
+            if self._rebinned:
+                hist.SetBins(len(self.edges) - 1, self.edges)
+            if not hist.GetSumw2N():
+                hist.Sumw2()
+            bin_contents(hist, overflow=True)[:] = contents
+            bin_variances(hist, overflow=True)[:] = variances
+        self._rebinned = False
+        self.stack.Modified()
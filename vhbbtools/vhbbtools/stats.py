@@ -0,0 +1,286 @@
+import numpy as np
+
+
+__all__ = [
+    'HistogramBatch',
+    'bin_contents',
+    'bin_variances',
+    'chi2_ndf',
+    'ks_test',
+    'pulls',
+    'ratio',
+]
+
+
+# The NumPy data types of the bin contents of the ROOT histogram classes.
+DTYPES = (
+    ('TH1D', np.float64),
+    ('TH1F', np.float32),
+    ('TH1I', np.int32),
+    ('TH1S', np.int16),
+    ('TH1C', np.int8),
+)
+
+
+def _buffer_view(buf, dtype, size):
+    """Return a NumPy array viewing a PyROOT buffer without copying it.
+    """
+    buf.SetSize(size)
+    return np.frombuffer(buf, dtype=dtype, count=size)
+
+
+def bin_contents(hist, overflow=False):
+    """Return a NumPy array viewing the bin contents of a 1-D ROOT histogram without
+    copying them, so that writing to the array modifies the histogram.
+
+    Parameters
+    ----------
+    hist : TH1
+        The histogram, whose class must be one of TH1D, TH1F, TH1I, TH1S, or TH1C.
+
+    overflow : bool, optional
+        Whether to include the underflow and overflow bins. The default is False.
+    """
+    for class_name, dtype in DTYPES:
+        if hist.InheritsFrom(class_name):
+            break
+    else:
+        raise TypeError('Unsupported histogram class: {}'.format(hist.ClassName()))
+    contents = _buffer_view(hist.GetArray(), dtype, hist.GetNcells())
+    return contents if overflow else contents[1:-1]
+
+
+def bin_variances(hist, overflow=False):
+    """Return the squared bin errors of a 1-D ROOT histogram as a NumPy array. If the
+    histogram stores the sum of squared weights, the array views them without copying.
+    Otherwise, the errors are Poisson and the variances are the absolute bin contents.
+
+    Parameters
+    ----------
+    hist : TH1
+        The histogram.
+
+    overflow : bool, optional
+        Whether to include the underflow and overflow bins. The default is False.
+    """
+    if hist.GetSumw2N():
+        sumw2 = hist.GetSumw2()
+        variances = _buffer_view(sumw2.GetArray(), np.float64, sumw2.GetSize())
+        return variances if overflow else variances[1:-1]
+    return np.abs(bin_contents(hist, overflow), dtype=np.float64)
+
+
+class HistogramBatch(object):
+    """The bin contents and variances of many 1-D histograms, read once into flat arrays
+    along with the offset of each histogram, so that a statistic is computed for all of
+    them by a handful of vectorised NumPy calls no matter how many there are.
+
+    Only the bins within the range of the x-axis of each histogram are included, which
+    are all of the bins except the underflow and overflow unless the range was set.
+
+    Parameters
+    ----------
+    hists : iterable of TH1 or THStack
+        The histograms. A THStack stands for the sum of its histograms.
+    """
+    def __init__(self, hists):
+        contents, variances = [], []
+        for hist in hists:
+            if hist.InheritsFrom('THStack'):
+                hist = hist.GetStack().Last()
+            x_axis = hist.GetXaxis()
+            bins = slice(x_axis.GetFirst(), x_axis.GetLast() + 1)
+            contents.append(bin_contents(hist, overflow=True)[bins])
+            variances.append(bin_variances(hist, overflow=True)[bins])
+        self.lengths = np.array([len(c) for c in contents], dtype=np.intp)
+        if not len(self.lengths) or not self.lengths.all():
+            raise ValueError('Expected at least one histogram, each with at least one bin.')
+        self.offsets = np.concatenate(([0], np.cumsum(self.lengths)[:-1]))
+        self.contents = np.concatenate(contents).astype(np.float64)
+        self.variances = np.concatenate(variances).astype(np.float64)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def sum(self, values):
+        """Return the sum of per-bin values over the bins of each histogram.
+        """
+        return np.add.reduceat(values, self.offsets)
+
+    def broadcast(self, values):
+        """Return the per-histogram values repeated over the bins of each histogram.
+        """
+        return np.repeat(values, self.lengths)
+
+    def split(self, values):
+        """Return the per-bin values split into an array for each histogram.
+        """
+        return np.split(values, self.offsets[1:])
+
+
+def _as_batches(data, mc):
+    """Return the data and MC as HistogramBatch objects with matching binning and whether
+    single histograms were passed rather than sequences of them.
+    """
+    single = not isinstance(data, (HistogramBatch, list, tuple))
+    if single:
+        data, mc = [data], [mc]
+    if not isinstance(data, HistogramBatch):
+        data = HistogramBatch(data)
+    if not isinstance(mc, HistogramBatch):
+        mc = HistogramBatch(mc)
+    if not np.array_equal(data.lengths, mc.lengths):
+        raise ValueError('The data and MC histograms must have the same number of bins.')
+    return data, mc, single
+
+
+def chi2_ndf(data, mc):
+    """Return the chi2/NDF between unweighted data and weighted MC histograms, computed
+    as by ROOT's TH1::Chi2Test with the option 'UWCHI2/NDF' but for all of them at once.
+
+    Bins empty in both histograms are skipped and lower the NDF by one. As in ROOT, the
+    variance of an empty MC bin without error is taken to be the average squared weight
+    of the MC histogram, i.e. its sum of squared weights over its sum of weights, which
+    is 1 unless the histogram is weighted or scaled. Where ROOT iteratively
+    increments the data of an empty bin whose MC has too large a relative uncertainty,
+    the increment is applied to that bin alone, which only matters for such bins.
+
+    Parameters
+    ----------
+    data : TH1, sequence of TH1, or HistogramBatch
+        The data histograms.
+
+    mc : TH1, THStack, sequence thereof, or HistogramBatch
+        The MC histograms, in the same order.
+
+    Returns
+    -------
+    chi2_ndf : float or array of floats
+        The chi2/NDF for each pair of histograms.
+    """
+    data, mc, single = _as_batches(data, mc)
+    n, w, s2 = data.contents, mc.contents, mc.variances
+    n_total = data.broadcast(data.sum(n))
+    w_total = data.broadcast(mc.sum(w))
+    empty = (n == 0) & (w == 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        average_s2 = data.broadcast(mc.sum(s2) / mc.sum(w))
+    s2 = np.where((s2 <= 0) & (w == 0), average_s2, s2)
+    var1 = w_total * w - n_total * s2
+    # An empty data bin with var1 <= 0 has no solution for the expected probability.
+    adjusted = (n == 0) & (var1 <= 0) & ~empty
+    n = np.where(adjusted, 1., n)
+    n_total = np.where(adjusted, n_total + 1, n_total)
+    var1 = w_total * w - n_total * s2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = (var1 + np.sqrt(var1 * var1 + 4 * w_total * w_total * n * s2)) / (2 * w_total * w_total)
+        terms = (n - n_total * p) ** 2 / (n_total * p)
+        terms += np.where(s2 > 0, (w - w_total * p) ** 2 / s2, 0.)
+    terms[empty] = 0.
+    ndf = data.lengths - 1 - data.sum(empty.astype(np.intp))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = data.sum(terms) / ndf
+    return result[0] if single else result
+
+
+def _kolmogorov_prob(z):
+    """Return the Kolmogorov distribution function as computed by TMath::KolmogorovProb.
+    """
+    u = np.abs(np.asarray(z, dtype=np.float64))
+    p = np.zeros_like(u)
+    p[u < 0.2] = 1.
+    low = (u >= 0.2) & (u < 0.755)
+    v = 1. / u[low] ** 2
+    p[low] = 1 - 2.50662827 * (
+        np.exp(-1.2337005501361697 * v) + np.exp(-11.103304951225528 * v) + np.exp(-30.842513753404244 * v)
+    ) / u[low]
+    mid = (u >= 0.755) & (u < 6.8116)
+    v = u[mid] ** 2
+    maxj = np.maximum(1, np.rint(3. / u[mid]))
+    for j, (factor, sign) in enumerate(zip((-2, -8, -18, -32), (1, -1, 1, -1))):
+        p[mid] += np.where(j < maxj, 2 * sign * np.exp(factor * v), 0.)
+    return p
+
+
+def ks_test(data, mc):
+    """Return the Kolmogorov-Smirnov probability that the data and MC histograms are
+    compatible, computed as by ROOT's TH1::KolmogorovTest with the default option but
+    for all of them at once, using the effective number of entries of each histogram.
+
+    Parameters
+    ----------
+    data : TH1, sequence of TH1, or HistogramBatch
+        The data histograms.
+
+    mc : TH1, THStack, sequence thereof, or HistogramBatch
+        The MC histograms, in the same order.
+
+    Returns
+    -------
+    prob : float or array of floats
+        The probability for each pair of histograms.
+    """
+    data, mc, single = _as_batches(data, mc)
+    data_sum, mc_sum = data.sum(data.contents), mc.sum(mc.contents)
+    data_cdf = np.cumsum(data.contents / data.broadcast(data_sum))
+    mc_cdf = np.cumsum(mc.contents / data.broadcast(mc_sum))
+    # Remove the running totals of the preceding histograms from the cumulative sums.
+    ends = np.cumsum(data.lengths) - 1
+    data_cdf -= data.broadcast(np.concatenate(([0.], data_cdf[ends[:-1]])))
+    mc_cdf -= data.broadcast(np.concatenate(([0.], mc_cdf[ends[:-1]])))
+    distance = np.maximum.reduceat(np.abs(data_cdf - mc_cdf), data.offsets)
+    data_entries = data_sum ** 2 / data.sum(data.variances)
+    mc_entries = mc_sum ** 2 / mc.sum(mc.variances)
+    prob = _kolmogorov_prob(distance * np.sqrt(data_entries * mc_entries / (data_entries + mc_entries)))
+    return prob[0] if single else prob
+
+
+def ratio(data, mc):
+    """Return the ratio of the data to the MC histograms and its error from the data,
+    for all of them at once. Bins with empty MC have a ratio and error of zero.
+
+    Parameters
+    ----------
+    data : TH1, sequence of TH1, or HistogramBatch
+        The data histograms.
+
+    mc : TH1, THStack, sequence thereof, or HistogramBatch
+        The MC histograms, in the same order.
+
+    Returns
+    -------
+    ratio, error : arrays of floats or lists of arrays of floats
+        The ratio and its error in each bin of each pair of histograms.
+    """
+    data, mc, single = _as_batches(data, mc)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.where(mc.contents != 0, data.contents / mc.contents, 0.)
+        errors = np.where(mc.contents != 0, np.sqrt(data.variances) / np.abs(mc.contents), 0.)
+    if single:
+        return values, errors
+    return data.split(values), data.split(errors)
+
+
+def pulls(data, mc):
+    """Return the residuals of the data with respect to the MC histograms in units of
+    their combined uncertainty, for all of them at once. Bins without any uncertainty
+    have a pull of zero.
+
+    Parameters
+    ----------
+    data : TH1, sequence of TH1, or HistogramBatch
+        The data histograms.
+
+    mc : TH1, THStack, sequence thereof, or HistogramBatch
+        The MC histograms, in the same order.
+
+    Returns
+    -------
+    pulls : array of floats or list of arrays of floats
+        The pull in each bin of each pair of histograms.
+    """
+    data, mc, single = _as_batches(data, mc)
+    sigma = np.sqrt(data.variances + mc.variances)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.where(sigma > 0, (data.contents - mc.contents) / sigma, 0.)
+    return values if single else data.split(values)